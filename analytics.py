@@ -0,0 +1,203 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+STREAMS = ("items", "unmatched", "pairs")
+
+
+class CountMinSketch:
+    """Approximate counts for any number of keys in width * depth counters.
+
+    Estimates never undercount; with the defaults they overcount by at most
+    about 0.1% of the total, with high probability.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+        self.total = 0
+
+    def add(self, key, count=1):
+        self.total += count
+        for i, row in enumerate(self.rows):
+            row[hash((i, key)) % self.width] += count
+
+    def estimate(self, key):
+        return min(row[hash((i, key)) % self.width] for i, row in enumerate(self.rows))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in k counters (Metwally et al.'s Space-Saving).
+
+    When a new key arrives and all counters are taken, it replaces the
+    smallest one and inherits its count, recorded as the possible error.
+    Any key seen more than total / k times is guaranteed to be present.
+
+    The smallest counter is found through a min-heap with lazy deletion:
+    every update pushes the key's new count, and outdated entries are
+    skipped when they reach the top. The heap is rebuilt from the counters
+    once it holds 4k entries, so an update costs O(log k) amortized.
+    """
+
+    def __init__(self, k=100):
+        self.k = k
+        self.counters = {}
+        self._heap = []
+        self._seq = itertools.count()
+
+    def add(self, key, count=1):
+        entry = self.counters.get(key)
+        if entry is not None:
+            entry[0] += count
+        elif len(self.counters) < self.k:
+            entry = self.counters[key] = [count, 0]
+        else:
+            while True:
+                floor, _, victim = heapq.heappop(self._heap)
+                current = self.counters.get(victim)
+                if current is not None and current[0] == floor:
+                    break
+            del self.counters[victim]
+            entry = self.counters[key] = [floor + count, floor]
+        heapq.heappush(self._heap, (entry[0], next(self._seq), key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(c, next(self._seq), name) for name, (c, _) in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, n=None):
+        """Return [(key, count, error)] by descending count."""
+        ranked = sorted(self.counters.items(), key=lambda kv: -kv[1][0])[:n]
+        return [(key, count, error) for key, (count, error) in ranked]
+
+
+class Analytics:
+    """Fixed-memory traffic statistics for /lost-found.
+
+    Three streams are tracked: extracted items, queries whose items matched
+    no spot, and (item, area) pairs. Each has a space-saving summary for
+    the heavy hitters and a count-min sketch for point estimates, so memory
+    stays the same however much traffic arrives. A background thread writes
+    a JSON snapshot per process to directory every interval seconds;
+    merge() combines the snapshots of all workers.
+    """
+
+    def __init__(self, directory=None, interval=60.0, top_k=100, width=2048, depth=4):
+        self.directory = directory
+        self.interval = interval
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset()
+
+    def record(self, items, area, matched):
+        """Count one /lost-found query."""
+        with self._lock:
+            self.queries += 1
+            for item in items:
+                self._add("items", item)
+                self._add("pairs", f"{item}|{area}")
+            if not matched:
+                self._add("unmatched", " ".join(items))
+
+    def estimate(self, stream, key):
+        """Approximate count of key in stream ("items", "unmatched" or "pairs")."""
+        with self._lock:
+            return self.sketches[stream].estimate(key)
+
+    def snapshot(self):
+        """Return this process's statistics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "since": self.since,
+                "time": time.time(),
+                "queries": self.queries,
+                "top": {
+                    stream: [{"key": key, "count": count, "error": error}
+                             for key, count, error in self.summaries[stream].top()]
+                    for stream in STREAMS
+                },
+            }
+
+    def flush(self):
+        """Write the snapshot to directory, replacing the previous one atomically."""
+        if not self.directory:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"analytics-{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def load_snapshots(self, max_age=None):
+        """Return the snapshots flushed by every process, this one live."""
+        snapshots = [self.snapshot()]
+        if not self.directory or not os.path.isdir(self.directory):
+            return snapshots
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name == f"analytics-{os.getpid()}.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if max_age is None or now - snapshot.get("time", 0) <= max_age:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def start(self):
+        """Start the flush thread once per process, with counts from zero."""
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            with self._lock:
+                self._reset()
+        self._pid = os.getpid()
+        if self.directory and self.interval > 0:
+            threading.Thread(target=self._run, name="analytics-flush", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing analytics: {str(e)}")
+
+    def _add(self, stream, key):
+        self.summaries[stream].add(key)
+        self.sketches[stream].add(key)
+
+    def _reset(self):
+        self.since = time.time()
+        self.queries = 0
+        self.summaries = {stream: SpaceSaving(self.top_k) for stream in STREAMS}
+        self.sketches = {stream: CountMinSketch(self.width, self.depth) for stream in STREAMS}
+
+
+def merge(snapshots, n=None):
+    """Combine per-process snapshots into one, summing counts per key."""
+    merged = {"processes": len(snapshots), "queries": sum(s.get("queries", 0) for s in snapshots), "top": {}}
+    for stream in STREAMS:
+        totals = {}
+        for snapshot in snapshots:
+            for row in snapshot.get("top", {}).get(stream, ()):
+                entry = totals.setdefault(row["key"], [0, 0])
+                entry[0] += row["count"]
+                entry[1] += row["error"]
+        ranked = sorted(totals.items(), key=lambda kv: -kv[1][0])[:n]
+        merged["top"][stream] = [{"key": key, "count": count, "error": error}
+                                 for key, (count, error) in ranked]
+    return merged
@@ -1,107 +1,458 @@
+import atexit
+import functools
+import hmac
 import json
 import logging
-import nltk
-from nltk.tokenize import word_tokenize
-from flask import Flask, request, jsonify, send_from_directory
+import math
+import os
+import tempfile
+import time
+from flask import Flask, request, jsonify, abort, g
 from flask_cors import CORS
+from analytics import Analytics, merge
+from broker import Broker
+from cache import ResultCache, SingleFlight
+from catalog import NO_MATCH, NO_MATCH_BODY, CatalogStore
+from limiter import RateLimiter
+from matchers import Shadow, get_matcher
+from logconfig import AsyncLogging, SamplingFilter
+from metrics import CallbackGauge, Counter, Histogram, Registry
+from nlp import PARITY_CORPUS, NLPPipeline, item_from_tokens, item_phrase
+from profiling import RequestProfiler
+from static_assets import REVALIDATE, StaticAssets
+from store import FoundStore
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: records go through a bounded queue to a background
+# thread that writes JSON lines, so a request never waits on log I/O.
+async_logging = AsyncLogging(
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    maxsize=int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+)
+async_logging.start()
+atexit.register(async_logging.stop)
 logger = logging.getLogger(__name__)
+# Opt-in recording of sanitized /lost-found requests for replay.py
+traffic_recorder = None
+if os.environ.get('TRAFFIC_LOG_PATH'):
+    from recorder import TrafficRecorder
+    traffic_recorder = TrafficRecorder(os.environ['TRAFFIC_LOG_PATH'])
+    traffic_recorder.start()
+    atexit.register(traffic_recorder.stop)
+# Per-request info lines, sampled at LOG_SAMPLE_RATE (warnings always kept)
+request_logger = logging.getLogger(f"{__name__}.requests")
+request_logger.addFilter(SamplingFilter(float(os.environ.get('LOG_SAMPLE_RATE', '1'))))
 
-# Define lost-and-found spots with areas
-spots = {
-    "Student Union Info Desk": {
-        "tags": ["bags", "phones", "keys", "electronics", "backpack"],
-        "link": "https://studentunion.arizona.edu",
-        "area": "Central Campus"
-    },
-    "UAPD Lost & Found": {
-        "tags": ["wallets", "tech", "catcard", "id", "valuable", "phone", "laptop"],
-        "link": "https://uapd.arizona.edu/lost-and-found",
-        "area": "Central Campus"
-    },
-    "Main Library Ask Us": {
-        "tags": ["books", "notebooks", "laptop", "study", "materials"],
-        "link": "https://library.arizona.edu",
-        "area": "Library Area"
-    },
-    "Likins Hall Desk": {
-        "tags": ["clothes", "personal", "keys", "dorm", "residential"],
-        "link": "https://housing.arizona.edu",
-        "area": "South Campus"
-    },
-    "Parking Office": {
-        "tags": ["bikes", "gear", "helmet", "skateboard", "transportation"],
-        "link": "https://parking.arizona.edu",
-        "area": "East Campus"
-    }
-}
+# Built once per process; with gunicorn preload_app this happens in the
+# master before workers are forked. The default regex tokenizer needs no
+# NLTK import or data; NLP_TOKENIZER=nltk switches to word_tokenize.
+pipeline = NLPPipeline(os.environ.get('NLP_TOKENIZER', 'regex')).load()
+
+# Optional semantic fallback for items no tag, synonym or typo matches.
+# Needs numpy and a GloVe/word2vec text file; imported only when configured.
+semantic_engine = None
+if os.environ.get('SEMANTIC_VECTORS_PATH'):
+    from semantic import SemanticEngine
+    semantic_engine = SemanticEngine(
+        os.environ['SEMANTIC_VECTORS_PATH'],
+        max_words=int(os.environ.get('SEMANTIC_MAX_WORDS', '200000')),
+        min_score=float(os.environ.get('SEMANTIC_MIN_SCORE', '0.5'))
+    )
+
+# How items are matched to catalog terms: exact, substring, fuzzy or
+# semantic (see matchers.py). fuzzy is the default without word vectors.
+MATCH_ENGINE = os.environ.get('MATCH_ENGINE', 'semantic' if semantic_engine else 'fuzzy')
+for _engine in (MATCH_ENGINE, os.environ.get('SHADOW_ENGINE')):
+    if _engine == 'semantic' and semantic_engine is None:
+        raise ValueError("The semantic match engine needs SEMANTIC_VECTORS_PATH")
+matcher = get_matcher(MATCH_ENGINE)
+
+# Lost-and-found spots are read from spots.json and compiled into tag and
+# area indexes; edits to the file are picked up without a restart.
+catalog_store = CatalogStore(
+    os.environ.get('SPOTS_CATALOG_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spots.json')),
+    interval=float(os.environ.get('SPOTS_RELOAD_INTERVAL', '5')),
+    semantic=semantic_engine
+)
+
+# Serialized /lost-found responses keyed on (extracted items, area)
+result_cache = ResultCache(
+    maxsize=int(os.environ.get('LOST_FOUND_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('LOST_FOUND_CACHE_TTL', '300'))
+)
+# Identical misses arriving together share one computation
+single_flight = SingleFlight()
+
+# Found items reported by the desks (SQLite, WAL mode). The database must
+# live on persistent local disk, so there is no default: without
+# FOUND_DB_PATH the found-item endpoints and the stream answer 503
+FOUND_DB_PATH = os.environ.get('FOUND_DB_PATH')
+found_store = FoundStore(FOUND_DB_PATH) if FOUND_DB_PATH else None
+# Shared secret desks send as X-Report-Token; unset refuses every report
+FOUND_ITEMS_TOKEN = os.environ.get('FOUND_ITEMS_TOKEN')
+# Upper bound on results from GET /found-items
+FOUND_ITEMS_MAX_LIMIT = int(os.environ.get('FOUND_ITEMS_MAX_LIMIT', '200'))
+
+# Pushes new found-item reports to /lost-found/stream clients; one thread
+# per process polls the store, whichever worker took the report
+broker = Broker(
+    found_store,
+    interval=float(os.environ.get('STREAM_POLL_INTERVAL', '1')),
+    queue_size=int(os.environ.get('STREAM_QUEUE_SIZE', '100')),
+    max_subscribers=int(os.environ.get('STREAM_MAX_SUBSCRIBERS', '50'))
+) if found_store is not None else None
+# Seconds between keepalive comments on an idle stream
+STREAM_HEARTBEAT = float(os.environ.get('STREAM_HEARTBEAT', '15'))
+
+# Heavy-hitter statistics over /lost-found queries in fixed memory, flushed
+# as one JSON snapshot per worker to ANALYTICS_DIR
+analytics = Analytics(
+    directory=os.environ.get('ANALYTICS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analytics')),
+    interval=float(os.environ.get('ANALYTICS_FLUSH_INTERVAL', '60')),
+    top_k=int(os.environ.get('ANALYTICS_TOP_K', '100'))
+)
+# Required in X-Admin-Token for /admin endpoints; unset disables them
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# cProfile for a sampled fraction of /lost-found requests (0 = none), or
+# for admin requests sending X-Profile: 1; adjustable at /admin/profiling
+profiler = RequestProfiler(
+    os.environ.get('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', '0')),
+    keep=int(os.environ.get('PROFILE_KEEP', '50')),
+    enabled=os.environ.get('PROFILE_ENABLED', '1') == '1',
+    interval=float(os.environ.get('PROFILE_POLL_INTERVAL', '1'))
+)
 
-app = Flask(__name__, static_folder='.', static_url_path='')
+MATCH_ERROR = {"name": "Error processing request", "link": "", "area": ""}
+
+# Longest item description accepted by any endpoint, in characters
+MAX_ITEM_LENGTH = int(os.environ.get('MAX_ITEM_LENGTH', '200'))
+
+# Upper bound on {item, area} pairs accepted by /lost-found/batch
+BATCH_MAX_ITEMS = int(os.environ.get('LOST_FOUND_BATCH_MAX_ITEMS', '20'))
+
+# Admission control for the lookup endpoints: a token bucket per client
+# (RATE_LIMIT_RPS=0 disables it) and a cap on requests in flight
+limiter = RateLimiter(
+    rate=float(os.environ.get('RATE_LIMIT_RPS', '10')),
+    burst=float(os.environ.get('RATE_LIMIT_BURST', '20')),
+    max_clients=int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', '10000')),
+    max_concurrent=int(os.environ.get('RATE_LIMIT_MAX_CONCURRENT', '64'))
+)
+# API keys that get their own bucket instead of sharing their IP's
+RATE_LIMIT_API_KEYS = set(filter(None, os.environ.get('RATE_LIMIT_API_KEYS', '').split(',')))
+# Proxies in front of the app that append to X-Forwarded-For (1 on Cloud Run)
+RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', '1'))
+
+# Metrics exposed on /metrics. Each worker flushes its values to
+# METRICS_DIR and a scrape sums every worker's, so any worker can answer
+# for the instance; the default directory is private to this master process
+metrics = Registry(
+    directory=os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), f'lost-found-metrics-{os.getpid()}')),
+    interval=float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+)
+atexit.register(metrics.flush)
+REQUEST_SECONDS = metrics.register(Histogram(
+    'lost_found_request_duration_seconds', 'Total request time by endpoint.', ('endpoint',)))
+STAGE_SECONDS = metrics.register(Histogram(
+    'lost_found_stage_duration_seconds', 'Time spent in each /lost-found stage.', ('stage',)))
+REQUESTS = metrics.register(Counter(
+    'lost_found_requests_total', 'Requests by endpoint and status code.', ('endpoint', 'status')))
+REJECTED = metrics.register(Counter(
+    'lost_found_rejected_total', 'Requests refused by admission control.', ('reason',)))
+ERRORS = metrics.register(Counter(
+    'lost_found_errors_total', 'Errors caught while processing requests.', ('stage',)))
+for _name in ('hits', 'misses', 'evictions', 'invalidations'):
+    metrics.register(CallbackGauge(
+        f'lost_found_cache_{_name}_total', f'Result cache {_name}.',
+        lambda name=_name: getattr(result_cache, name), kind='counter'))
+SHADOW_SECONDS = metrics.register(Histogram(
+    'lost_found_shadow_lookup_duration_seconds', 'Lookup time of the primary and shadow engines on sampled queries.',
+    ('engine',)))
+SHADOW_OUTCOMES = metrics.register(Counter(
+    'lost_found_shadow_outcomes_total', 'Shadow engine results compared with the primary engine.',
+    ('engine', 'outcome')))
+metrics.register(CallbackGauge(
+    'lost_found_coalesced_total', 'Cache misses that waited on an identical in-flight lookup.',
+    lambda: single_flight.coalesced, kind='counter'))
+metrics.register(CallbackGauge(
+    'lost_found_cache_entries', 'Entries currently in the result cache.',
+    lambda: result_cache.stats()['size']))
+metrics.register(CallbackGauge(
+    'lost_found_stream_subscribers', 'Clients connected to /lost-found/stream.',
+    lambda: broker.subscribers if broker is not None else 0))
+metrics.register(CallbackGauge(
+    'lost_found_stream_events_dropped_total', 'Stream events dropped because a client fell behind.',
+    lambda: broker.dropped if broker is not None else 0, kind='counter'))
+metrics.register(CallbackGauge(
+    'lost_found_log_records_dropped_total', 'Log records dropped because the log queue was full.',
+    lambda: async_logging.handler.dropped, kind='counter'))
+
+# Optional shadow engine, run off the request path on a sample of queries
+# and compared with the primary; see lost_found_shadow_* metrics
+shadow = None
+if os.environ.get('SHADOW_ENGINE'):
+    shadow = Shadow(
+        matcher, get_matcher(os.environ['SHADOW_ENGINE']),
+        sample_rate=float(os.environ.get('SHADOW_SAMPLE_RATE', '0.01')),
+        latency=SHADOW_SECONDS, outcomes=SHADOW_OUTCOMES
+    )
+    metrics.register(CallbackGauge(
+        'lost_found_shadow_dropped_total', 'Sampled queries dropped because the shadow queue was full.',
+        lambda: shadow.dropped, kind='counter'))
+
+# Frontend files, fingerprinted and precompressed once at startup
+static_assets = StaticAssets(os.path.dirname(os.path.abspath(__file__)))
+
+app = Flask(__name__, static_folder=None)
 CORS(app, resources={
     r"/lost-found": {
         "origins": "*",
         "methods": ["GET", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization"],
+        "max_age": 86400
+    },
+    r"/lost-found/batch": {
+        "origins": "*",
+        "methods": ["POST", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Authorization"],
+        "max_age": 86400
+    },
+    r"/lost-found/stream": {
+        "origins": "*",
+        "methods": ["GET"],
+        "allow_headers": ["Last-Event-ID"],
+        "max_age": 86400
+    },
+    r"/catalog": {
+        "origins": "*",
+        "methods": ["GET"],
+        "expose_headers": ["ETag", "X-Catalog-Version"],
+        "max_age": 86400
+    },
+    r"/found-items": {
+        "origins": "*",
+        "methods": ["GET", "POST", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Authorization", "X-Report-Token"],
+        "max_age": 86400
     }
 })
 
+def client_key():
+    """Identify the caller: a known API key, else the client IP."""
+    api_key = request.headers.get('X-API-Key')
+    if api_key in RATE_LIMIT_API_KEYS:
+        return f'key:{api_key}'
+    forwarded = [hop.strip() for hop in request.headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+    if RATE_LIMIT_PROXY_HOPS and len(forwarded) >= RATE_LIMIT_PROXY_HOPS:
+        return f'ip:{forwarded[-RATE_LIMIT_PROXY_HOPS]}'
+    return f'ip:{request.remote_addr}'
+
+def rate_limited(cost=None):
+    """Refuse over-limit requests with 429, or 503 when all slots are busy."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method == 'OPTIONS':
+                return view(*args, **kwargs)
+            wait = limiter.check(client_key(), cost() if cost else 1)
+            if wait:
+                REJECTED.inc('rate')
+                return overloaded(429, 'Too many requests.', wait)
+            if not limiter.enter():
+                REJECTED.inc('concurrency')
+                return overloaded(503, 'Server busy, please retry.', 1)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                limiter.leave()
+        return wrapper
+    return decorator
+
+def overloaded(status, message, retry_after):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    return response
+
+def profiled(view):
+    """Run the view under the profiler when sampled or asked to by an admin."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return view(*args, **kwargs)
+        forced = request.headers.get('X-Profile') == '1' and is_admin()
+        if not forced and not profiler.sampled():
+            return view(*args, **kwargs)
+        response, path = profiler.run(view.__name__, view, *args, **kwargs)
+        response = app.make_response(response)
+        if path is None:
+            ERRORS.inc('profile')
+        elif forced:
+            response.headers['X-Profile-Id'] = os.path.basename(path)
+        return response
+    return wrapper
+
+def is_admin():
+    """True if ADMIN_TOKEN is set and the request carries it in X-Admin-Token."""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+
+def can_report():
+    """True if FOUND_ITEMS_TOKEN is set and the request carries it in X-Report-Token."""
+    return bool(FOUND_ITEMS_TOKEN) and hmac.compare_digest(
+        request.headers.get('X-Report-Token', ''), FOUND_ITEMS_TOKEN)
+
+def batch_cost():
+    """Charge a batch one token per query it carries."""
+    payload = request.get_json(force=True, silent=True)
+    queries = payload.get('queries') if isinstance(payload, dict) else None
+    return max(1, min(len(queries), BATCH_MAX_ITEMS)) if isinstance(queries, list) else 1
+
 def extract_item(text):
-    """Extract lost item from natural language input using NLTK."""
-    nltk.download('punkt', quiet=True)
+    """Extract lost item from natural language input."""
     try:
-        tokens = word_tokenize(text.lower())
-        item = None
-        for i, token in enumerate(tokens):
-            if token in ["lost", "my"] and i + 1 < len(tokens):
-                next_token = tokens[i + 1]
-                if next_token not in ["my", "near", "at", "in", "the"]:
-                    item = next_token
-                    break
-        if not item:
-            stopwords = ["i", "lost", "my", "near", "at", "in", "the"]
-            for token in tokens:
-                if token.isalnum() and token not in stopwords:
-                    item = token
-                    break
-        logger.info(f"Extracted item '{item}' from text: '{text}'")
+        item = item_from_tokens(pipeline.tokenize(text.lower()))
+        request_logger.info("Extracted item", extra={'item': item, 'text': text})
         return item if item else "unknown"
     except Exception as e:
         logger.error(f"Error in extract_item: {str(e)}")
+        ERRORS.inc('extract')
         return "unknown"
 
-def match_spots(item, user_area):
+def find_items(text, catalog=None):
+    """Find every catalog item named in text plus the head word of the item phrase.
+
+    The head word (the last word of nlp.item_phrase) is added only when no
+    catalog term was found inside the item phrase, so a location that is
+    also a tag ("dorm") cannot hide the item, while a phrase the catalog
+    already covers ("car keys", "notebook back") adds nothing.
+    """
+    try:
+        items = list((catalog or catalog_store.current).find_items(text))
+        words = item_phrase(pipeline.tokenize(text.lower()))
+    except Exception as e:
+        logger.error(f"Error in find_items: {str(e)}")
+        ERRORS.inc('extract')
+        return (extract_item(text),)
+    phrase = " ".join(words)
+    if words and not any(term in phrase for term in items):
+        items.insert(0, words[-1])
+    if not items:
+        items.append(extract_item(text))
+    request_logger.info("Found items", extra={'items': items, 'text': text})
+    return tuple(items)
+
+def extract_items(texts):
+    """Find items for many inputs, scanning each distinct text once."""
+    extracted = {}
+    for text in texts:
+        key = text.strip().lower()
+        if key not in extracted:
+            extracted[key] = find_items(key)
+    return [extracted[text.strip().lower()] for text in texts]
+
+def normalize_item(text):
+    """Reduce a found-item description to one key, the same for reports and searches.
+
+    A catalog term in the item's phrase maps to its tag ("black leather
+    wallet" and "my billfold" both give wallets); any other item to the last
+    word of its phrase ("red water bottle" gives bottle).
+    """
+    try:
+        words = item_phrase(pipeline.tokenize(text.lower()))
+        if not words:
+            return extract_item(text)
+        catalog = catalog_store.current
+        terms = catalog.find_items(" ".join(words))
+        item = terms[-1] if terms else words[-1]
+        return catalog.canonical.get(item, item)
+    except Exception as e:
+        logger.error(f"Error in normalize_item: {str(e)}")
+        ERRORS.inc('extract')
+        return extract_item(text)
+
+def match_spots(item, user_area, catalog=None):
     """Match extracted item to lost-and-found spots, prioritizing by area."""
     try:
+        catalog = catalog or catalog_store.current
         item = item.lower()
-        matches = []
-        for spot, data in spots.items():
-            if any(tag in item or item in tag for tag in data["tags"]):
-                matches.append({
-                    "name": spot,
-                    "link": data["link"],
-                    "area": data["area"]
-                })
-        sorted_matches = sorted(matches, key=lambda x: x["area"] != user_area)
-        if not sorted_matches:
-            return [{
-                "name": "Check UAPD Lost & Found",
-                "link": "https://uapd.arizona.edu/lost-and-found",
-                "area": "Central Campus",
-                "note": "No exact matches found, but UAPD handles all types of lost items."
-            }]
-        return sorted_matches
+        spot_ids = catalog.rank(catalog.lookup(item, matcher), user_area)
+        if not spot_ids:
+            return [dict(NO_MATCH)]
+        return [dict(catalog.entries[i]) for i in spot_ids]
     except Exception as e:
         logger.error(f"Error in match_spots: {str(e)}")
-        return [{"name": "Error processing request", "link": "", "area": ""}]
+        ERRORS.inc('match')
+        return [MATCH_ERROR]
+
+@app.before_request
+def start_timer():
+    g.start_time = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    endpoint = request.endpoint or 'unknown'
+    if 'start_time' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.start_time, endpoint)
+    REQUESTS.inc(endpoint, response.status_code)
+    return response
 
 @app.route('/')
 def serve_index():
     """Serve the frontend index.html."""
-    return send_from_directory('.', 'index.html')
+    return serve_asset('index.html')
+
+@app.route('/<path:filename>')
+def serve_asset(filename):
+    """Serve a precompressed frontend file; nothing else on disk is exposed."""
+    entry = static_assets.get(filename)
+    if entry is None:
+        abort(404)
+    asset, cache_control = entry
+    encoding, body, etag = asset.negotiate(request.accept_encodings)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, content_type=asset.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/catalog')
+def catalog_snapshot():
+    """Serve the compact catalog for client-side matching.
+
+    The snapshot is built and compressed once per catalog load; clients
+    revalidate with If-None-Match and get a 304 until the catalog changes.
+    """
+    catalog = catalog_store.current
+    encoding, body, etag = catalog.snapshot.negotiate(request.accept_encodings)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, content_type=catalog.snapshot.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = REVALIDATE
+    response.headers['X-Catalog-Version'] = catalog.version
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/ready')
+def ready():
+    """Readiness check: 200 once the NLP pipeline is loaded and warmed up."""
+    if not pipeline.ready or not warmed:
+        return jsonify({'status': 'loading'}), 503
+    return jsonify({'status': 'ready'})
 
 @app.route('/lost-found', methods=['GET', 'OPTIONS'])
+@rate_limited()
+@profiled
 def lost_found():
     """Main endpoint for lost item processing."""
     if request.method == 'OPTIONS':
@@ -109,21 +460,340 @@ def lost_found():
         response.headers.add('Access-Control-Allow-Origin', '*')
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
         response.headers.add('Access-Control-Allow-Methods', 'GET,OPTIONS')
+        response.headers.add('Access-Control-Max-Age', '86400')
         return response
 
     item_text = request.args.get('item')
     user_area = request.args.get('area')
-    logger.info(f"Received request - Item: {item_text}, Area: {user_area}")
+    request_logger.info("Received request", extra={'item': item_text, 'area': user_area})
     
     if not item_text or not user_area:
-        logger.warning("Missing required parameters")
+        request_logger.warning("Missing required parameters")
         return jsonify({'error': 'Missing "item" or "area".'}), 400
-    
-    extracted_item = extract_item(item_text)
-    matches = match_spots(extracted_item, user_area)
-    response = jsonify(matches)
+    if len(item_text) > MAX_ITEM_LENGTH:
+        return jsonify({'error': f'"item" must be at most {MAX_ITEM_LENGTH} characters.'}), 400
+
+    if traffic_recorder is not None:
+        traffic_recorder.record(item_text, user_area)
+    start = time.perf_counter()
+    items = find_items(item_text)
+    STAGE_SECONDS.observe(time.perf_counter() - start, 'extract')
+    body, etag = match_body(items, user_area)
+    analytics.record(items, user_area, body != NO_MATCH_BODY)
+    if shadow is not None:
+        shadow.offer(catalog_store.current, items)
+    built = time.perf_counter()
+    if etag and request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    now = time.perf_counter()
+    STAGE_SECONDS.observe(now - built, 'response')
+    STAGE_SECONDS.observe(now - start, 'total')
+    return response
+
+@app.route('/lost-found/batch', methods=['POST'])
+@rate_limited(cost=batch_cost)
+def lost_found_batch():
+    """Process many {item, area} pairs in one request, answering in order.
+
+    The body is parsed as JSON whatever its Content-Type, so clients may
+    send text/plain and skip the CORS preflight entirely.
+    """
+    payload = request.get_json(force=True, silent=True)
+    queries = payload.get('queries') if isinstance(payload, dict) else None
+    if not isinstance(queries, list) or not queries:
+        return jsonify({'error': 'Expected a JSON body with a non-empty "queries" list.'}), 400
+    if len(queries) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'At most {BATCH_MAX_ITEMS} queries per batch.'}), 413
+    request_logger.info("Received batch request", extra={'queries': len(queries)})
+
+    missing = jsonify({'error': 'Missing "item" or "area".'}).get_data().rstrip(b'\n')
+    too_long = jsonify({'error': f'"item" must be at most {MAX_ITEM_LENGTH} characters.'}).get_data().rstrip(b'\n')
+    errors = []
+    for q in queries:
+        if not (isinstance(q, dict) and isinstance(q.get('item'), str) and q['item'].strip()
+                and isinstance(q.get('area'), str) and q['area'] != ''):
+            errors.append(missing)
+        elif len(q['item']) > MAX_ITEM_LENGTH:
+            errors.append(too_long)
+        else:
+            errors.append(None)
+    items = iter(extract_items([q['item'] for q, error in zip(queries, errors) if error is None]))
+    bodies = {}
+    results = []
+    for q, error in zip(queries, errors):
+        if error is not None:
+            results.append(error)
+            continue
+        key = (next(items), q['area'])
+        if key not in bodies:
+            bodies[key] = match_body(*key)[0].rstrip(b'\n')
+        results.append(bodies[key])
+
+    body = b'{"results":[' + b','.join(results) + b']}\n'
+    response = app.response_class(body, mimetype='application/json')
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    return response
+
+def requires_found_store(view):
+    """503 unless FOUND_DB_PATH points the found-item store at a database."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if found_store is None:
+            response = jsonify({'error': 'Found items are not configured on this server.'})
+            response.status_code = 503
+            response.headers.add('Access-Control-Allow-Origin', '*')
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/found-items', methods=['POST'])
+@rate_limited()
+@requires_found_store
+def report_found_item():
+    """Register an item turned in at a desk."""
+    if not can_report():
+        return jsonify({'error': 'Invalid or missing report token.'}), 403
+    payload = request.get_json(force=True, silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    item = payload.get('item')
+    area = payload.get('area')
+    if not isinstance(item, str) or not item.strip() or not isinstance(area, str) or not area:
+        return jsonify({'error': 'Missing "item" or "area".'}), 400
+    if len(item) > MAX_ITEM_LENGTH:
+        return jsonify({'error': f'"item" must be at most {MAX_ITEM_LENGTH} characters.'}), 400
+    spot = payload.get('spot', '')
+    description = payload.get('description', '')
+    if not isinstance(spot, str) or not isinstance(description, str):
+        return jsonify({'error': '"spot" and "description" must be strings.'}), 400
+    try:
+        record = found_store.add(item.strip(), normalize_item(item), area, spot, description)
+    except Exception as e:
+        logger.error(f"Error in report_found_item: {str(e)}")
+        ERRORS.inc('store')
+        return jsonify({'error': 'Could not save the report.'}), 500
+    request_logger.info("Found item reported", extra={'item': record['item_norm'], 'area': area})
+    response = jsonify(record)
+    response.status_code = 201
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    return response
+
+@app.route('/found-items', methods=['GET'])
+@rate_limited()
+@requires_found_store
+def search_found_items():
+    """Search reported items by item, area and report time, newest first."""
+    item = request.args.get('item')
+    area = request.args.get('area')
+    if item and len(item) > MAX_ITEM_LENGTH:
+        return jsonify({'error': f'"item" must be at most {MAX_ITEM_LENGTH} characters.'}), 400
+    try:
+        since = float(request.args['since']) if 'since' in request.args else None
+        limit = int(request.args.get('limit', '50'))
+    except ValueError:
+        return jsonify({'error': '"since" must be a Unix timestamp and "limit" an integer.'}), 400
+    limit = max(1, min(limit, FOUND_ITEMS_MAX_LIMIT))
+    try:
+        results = found_store.search(normalize_item(item) if item else None, area or None, since, limit)
+    except Exception as e:
+        logger.error(f"Error in search_found_items: {str(e)}")
+        ERRORS.inc('store')
+        return jsonify({'error': 'Could not search found items.'}), 500
+    response = jsonify({'results': results})
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    return response
+
+@app.route('/lost-found/stream')
+@rate_limited()
+@requires_found_store
+def lost_found_stream():
+    """Push newly reported found items as Server-Sent Events.
+
+    Optional "area" and "item" parameters filter the stream. A client that
+    reconnects with Last-Event-ID first receives the reports it missed.
+    Streams are refused on single-threaded servers (gunicorn's sync worker),
+    where one would hold the worker and block every other request.
+    """
+    if not request.environ.get('wsgi.multithread'):
+        REJECTED.inc('stream')
+        return overloaded(503, 'Streaming needs a threaded or async worker.', STREAM_HEARTBEAT)
+    area = request.args.get('area') or None
+    item = request.args.get('item')
+    item = normalize_item(item) if item else None
+    try:
+        last_id = int(request.headers['Last-Event-ID'])
+    except (KeyError, ValueError):
+        last_id = None
+    sub = broker.subscribe(area, item)
+    if sub is None:
+        REJECTED.inc('stream')
+        return overloaded(503, 'Too many stream subscribers.', STREAM_HEARTBEAT)
+
+    def wanted(event):
+        return (area is None or event['area'] == area) and (item is None or event['item_norm'] == item)
+
+    def events():
+        sent = 0
+        yield 'retry: 5000\n\n'
+        if last_id is not None:
+            for event in found_store.after(last_id):
+                if wanted(event):
+                    yield sse_event(event)
+                sent = event['id']
+        while True:
+            event = sub.get(STREAM_HEARTBEAT)
+            if event is None:
+                yield ': keepalive\n\n'
+            elif event['id'] > sent:
+                yield sse_event(event)
+
+    response = app.response_class(events(), mimetype='text/event-stream')
+    response.call_on_close(lambda: broker.unsubscribe(sub))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
     response.headers.add('Access-Control-Allow-Origin', '*')
     return response
 
+def sse_event(event):
+    return f"id: {event['id']}\nevent: found-item\ndata: {json.dumps(event, sort_keys=True)}\n\n"
+
+def match_body(items, user_area):
+    """Return (body, etag) of the merged matches for items, using the result cache.
+
+    Concurrent misses for the same key wait on a single computation.
+    """
+    catalog = catalog_store.current
+    key = (items, user_area)
+    result = result_cache.get(key, catalog.version)
+    if result is None:
+        result = single_flight.do((catalog.version, key), lambda: compute_body(catalog, key))
+    return result
+
+def compute_body(catalog, key):
+    start = time.perf_counter()
+    try:
+        result = catalog.results_many(*key, matcher)
+    except Exception as e:
+        logger.error(f"Error in match_body: {str(e)}")
+        ERRORS.inc('match')
+        return jsonify([MATCH_ERROR]).get_data(), None
+    STAGE_SECONDS.observe(time.perf_counter() - start, 'match')
+    result_cache.put(key, result, catalog.version)
+    return result
+
+def admin_only(view):
+    """404 unless ADMIN_TOKEN is set and sent in the X-Admin-Token header."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin():
+            abort(404)
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/admin/analytics')
+@admin_only
+def admin_analytics():
+    """Top items, unmatched queries and (item, area) pairs across workers.
+
+    ?item= adds this worker's count-min estimate for one item.
+    """
+    try:
+        limit = int(request.args.get('limit', '20'))
+    except ValueError:
+        return jsonify({'error': '"limit" must be an integer.'}), 400
+    snapshots = analytics.load_snapshots(max_age=3 * analytics.interval)
+    report = merge(snapshots, limit)
+    item = request.args.get('item')
+    if item:
+        report['estimate'] = {'item': item, 'count': analytics.estimate('items', item.lower())}
+    return jsonify(report)
+
+@app.route('/admin/profiling', methods=['GET', 'POST'])
+@admin_only
+def admin_profiling():
+    """Show or change the profiler settings and list the retained profiles.
+
+    POST {"enabled": bool, "sample_rate": float} to change them at runtime;
+    every worker picks the change up within PROFILE_POLL_INTERVAL seconds.
+    """
+    if request.method == 'POST':
+        payload = request.get_json(force=True, silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({'error': 'Expected a JSON object.'}), 400
+        enabled = payload.get('enabled')
+        if enabled is not None and not isinstance(enabled, bool):
+            return jsonify({'error': '"enabled" must be true or false.'}), 400
+        rate = payload.get('sample_rate')
+        if rate is not None and (isinstance(rate, bool) or not isinstance(rate, (int, float)) or not 0 <= rate <= 1):
+            return jsonify({'error': '"sample_rate" must be between 0 and 1.'}), 400
+        try:
+            profiler.configure(enabled, None if rate is None else float(rate))
+        except Exception as e:
+            logger.error(f"Error in admin_profiling: {str(e)}")
+            ERRORS.inc('profile')
+            return jsonify({'error': 'Could not save the profiler settings.'}), 500
+        logger.info(f"Profiler set to enabled={profiler.enabled} sample_rate={profiler.sample_rate}")
+    return jsonify({
+        'pid': os.getpid(),
+        'enabled': profiler.enabled,
+        'sample_rate': profiler.sample_rate,
+        'written': profiler.written,
+        'profiles': profiler.profiles(),
+    })
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Expose request, stage, cache and error metrics for Prometheus."""
+    return app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+def warmup():
+    """Prime the tokenizer, catalog memo and result cache before serving.
+
+    Runs the sample phrases through extraction and matching for every area,
+    so the first real requests find their regexes compiled, their bodies
+    rendered and the common (items, area) keys already cached. Under
+    gunicorn this happens once in the master and is inherited by workers.
+    """
+    global warmed, warmup_seconds
+    start = time.perf_counter()
+    try:
+        areas = list(catalog_store.current.areas)
+        for items in set(extract_items(PARITY_CORPUS)):
+            for area in areas:
+                match_body(items, area)
+    except Exception as e:
+        logger.error(f"Error in warmup: {str(e)}")
+    warmup_seconds = time.perf_counter() - start
+    warmed = True
+    logger.info(f"Warmed up in {warmup_seconds * 1000:.1f} ms")
+
+# /ready reports 503 until warmup() has run; WARMUP=0 skips it
+warmed = False
+warmup_seconds = 0.0
+if os.environ.get('WARMUP', '1') == '1':
+    warmup()
+else:
+    warmed = True
+
+def start_background_tasks():
+    """Start per-process threads; gunicorn calls this in every forked worker."""
+    async_logging.start()
+    metrics.start()
+    if traffic_recorder is not None:
+        traffic_recorder.start()
+    catalog_store.start()
+    profiler.start()
+    if broker is not None:
+        broker.start()
+    analytics.start()
+    if shadow is not None:
+        shadow.start()
+
 if __name__ == '__main__':
+    start_background_tasks()
     app.run(host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""Benchmarks for the /lost-found request path.
+
+Drives extract_item, find_items, match_spots and the full Flask handler
+(through the test client) over a fixed query corpus, against the real
+catalog scaled up with synthetic spots. Results are printed as JSON so runs from different
+commits can be diffed or loaded side by side:
+
+    python bench.py --sizes 5,1000,10000 --output bench.json
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import app
+from catalog import Catalog
+from matchers import ENGINES, get_matcher
+from metrics import summarize
+
+QUERIES = [
+    ("I lost my phone", "Central Campus"),
+    ("lost my keys near the library", "Library Area"),
+    ("my wallet is gone", "Central Campus"),
+    ("lost my laptop in the library", "Library Area"),
+    ("I lost my backpack at the student union", "Central Campus"),
+    ("lost my catcard", "Central Campus"),
+    ("lost my bike helmet", "East Campus"),
+    ("I think I lost my headphones", "South Campus"),
+    ("lost my notebook after class", "North Campus"),
+    ("my skateboard was left at the parking garage", "East Campus"),
+    ("lost my hoodie in the dorm", "South Campus"),
+    ("I lost my walet", "Central Campus"),
+    ("lost my lapptop", "Library Area"),
+    ("lost my ketys near the gym", "West Campus"),
+    ("lost my airpods", "Central Campus"),
+    ("keys", "South Campus"),
+    ("phone", "Central Campus"),
+    ("lost my water bottle", "North Campus"),
+    ("I lost my glasses near the rec center", "West Campus"),
+    ("lost my umbrella", "Library Area"),
+]
+
+EXTRA_WORDS = [
+    "umbrella", "bottle", "glasses", "sunglasses", "calculator", "jacket",
+    "charger", "tablet", "textbook", "lanyard", "badge", "ring", "watch",
+    "earbuds", "scooter", "lock", "mug", "camera", "instrument", "cleats",
+]
+
+
+def synthetic_spots(size, seed=0):
+    """Return the real catalog padded with generated spots up to size."""
+    with open(app.catalog_store.path) as f:
+        data = json.load(f)
+    spots = dict(list(data["spots"].items())[:size])
+    vocabulary = sorted({tag for spot in data["spots"].values() for tag in spot["tags"]}) + EXTRA_WORDS
+    areas = sorted({spot["area"] for spot in data["spots"].values()}) + ["North Campus", "West Campus"]
+    rng = random.Random(seed)
+    while len(spots) < size:
+        n = len(spots)
+        spots[f"Department Desk {n}"] = {
+            "tags": rng.sample(vocabulary, 4) + [f"dept{n}"],
+            "link": f"https://arizona.edu/desk/{n}",
+            "area": rng.choice(areas)
+        }
+    return spots, data.get("synonyms", {}), data.get("distances", {})
+
+
+def run(fn, args_list, iterations):
+    """Call fn over args_list iterations times, timing every call."""
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for args in args_list:
+            t = time.perf_counter()
+            fn(*args)
+            samples.append(time.perf_counter() - t)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def bench_engines(catalog, engines, iterations):
+    """Time each match engine's lookup side by side on the query corpus.
+
+    Alongside latency, reports how many spots each engine matched in total
+    and on how many queries its spots differ from the first engine's.
+    """
+    items = [(app.find_items(text, catalog),) for text, _ in QUERIES]
+    results = {}
+    baseline = None
+    for name in engines:
+        matcher = get_matcher(name)
+        found = [catalog.lookup_many(i, matcher) for (i,) in items]
+        if baseline is None:
+            baseline = found
+        results[name] = {
+            **run(lambda i: catalog.lookup_many(i, matcher), items, iterations),
+            "spots_matched": sum(len(ids) for ids in found),
+            "differs_from_first": sum(a != b for a, b in zip(found, baseline)),
+        }
+    return results
+
+
+def bench_size(size, iterations, engines=()):
+    spots, synonyms, distances = synthetic_spots(size)
+    catalog = Catalog(spots, synonyms, app.semantic_engine, distances)
+    app.catalog_store.current = catalog
+    client = app.app.test_client()
+    texts = [(text,) for text, _ in QUERIES]
+    items = [(app.extract_item(text), area) for text, area in QUERIES]
+    params = [{"item": text, "area": area} for text, area in QUERIES]
+
+    cache_size = app.result_cache.maxsize
+    app.result_cache.maxsize = 0
+    try:
+        uncached = run(lambda p: client.get('/lost-found', query_string=p), [(p,) for p in params], iterations)
+    finally:
+        app.result_cache.maxsize = cache_size
+    cached = run(lambda p: client.get('/lost-found', query_string=p), [(p,) for p in params], iterations)
+
+    return {
+        "spots": len(catalog.names),
+        "terms": len(catalog.index.postings),
+        "extract_item": run(app.extract_item, texts, iterations),
+        "find_items": run(app.find_items, texts, iterations),
+        "match_spots": run(app.match_spots, items, iterations),
+        "lost_found": uncached,
+        "lost_found_cached": cached,
+        "engines": bench_engines(catalog, engines, iterations),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='5,100,1000,10000',
+                        help='comma-separated catalog sizes (default: %(default)s)')
+    parser.add_argument('--iterations', type=int, default=50,
+                        help='passes over the query corpus per measurement (default: %(default)s)')
+    parser.add_argument('--engines', default='exact,substring,fuzzy',
+                        help=f'match engines to compare, from {",".join(ENGINES)} (default: %(default)s)')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+    engines = [name for name in args.engines.split(',') if name]
+
+    logging.disable(logging.INFO)
+    # Every request comes from the same test client; don't rate limit it
+    app.limiter.rate = 0
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    report = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "queries": len(QUERIES),
+        "iterations": args.iterations,
+        "results": [bench_size(int(size), args.iterations, engines) for size in args.sizes.split(',')],
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import logging
+import os
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One stream client: a bounded queue plus its area and item filters."""
+
+    def __init__(self, area=None, item=None, maxsize=100):
+        self.area = area
+        self.item = item
+        self.queue = queue.Queue(maxsize)
+
+    def get(self, timeout):
+        """Return the next event, or None if none arrived within timeout."""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class Broker:
+    """Fans newly reported found items out to stream subscribers.
+
+    A single publisher thread per process polls the found-item store for
+    rows it has not seen, so reports written by any worker reach every
+    worker's subscribers, and the database is queried once per interval no
+    matter how many clients are connected. Subscribers are indexed by area,
+    so an event only touches the clients that asked for its area (or for
+    every area). Each client has a bounded queue; when a slow client's
+    queue is full the event is dropped for that client rather than held in
+    memory or allowed to stall the others.
+    """
+
+    def __init__(self, store, interval=1.0, queue_size=100, max_subscribers=1000):
+        self.store = store
+        self.interval = interval
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.dropped = 0
+        self.subscribers = 0
+        self._by_area = {}
+        self._lock = threading.Lock()
+        self._last_id = None
+        self._pid = None
+
+    def subscribe(self, area=None, item=None):
+        """Register a client; return its Subscription, or None when full."""
+        with self._lock:
+            if self.subscribers >= self.max_subscribers:
+                return None
+            sub = Subscription(area, item, self.queue_size)
+            self._by_area.setdefault(area, set()).add(sub)
+            self.subscribers += 1
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._by_area.get(sub.area)
+            if subs is not None and sub in subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_area[sub.area]
+                self.subscribers -= 1
+
+    def publish(self, event):
+        """Queue event for every subscriber whose filters it matches."""
+        with self._lock:
+            targets = list(self._by_area.get(event["area"], ())) + list(self._by_area.get(None, ()))
+        for sub in targets:
+            if sub.item is not None and sub.item != event["item_norm"]:
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+
+    def poll(self):
+        """Publish the reports added since the last poll."""
+        if self._last_id is None:
+            self._last_id = self.store.last_id()
+            return
+        for event in self.store.after(self._last_id):
+            self._last_id = event["id"]
+            self.publish(event)
+
+    def start(self):
+        """Start the publisher thread once per process."""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._run, name="found-item-publisher", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                if self.subscribers:
+                    self.poll()
+                else:
+                    self._last_id = self.store.last_id()
+            except Exception as e:
+                logger.error(f"Error polling found items: {str(e)}")
+            time.sleep(self.interval)
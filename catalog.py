@@ -0,0 +1,515 @@
+import hashlib
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import deque
+
+from matchers import SemanticMatcher
+from static_assets import Asset
+
+# Substring, then typo, then (with a semantic engine) embedding matches
+DEFAULT_MATCHER = SemanticMatcher()
+
+logger = logging.getLogger(__name__)
+
+# Returned when nothing in the catalog matches an item
+NO_MATCH = {
+    "name": "Check UAPD Lost & Found",
+    "link": "https://uapd.arizona.edu/lost-and-found",
+    "area": "Central Campus",
+    "note": "No exact matches found, but UAPD handles all types of lost items."
+}
+# The response body served for NO_MATCH, as _serialize would render it
+NO_MATCH_BODY = json.dumps([NO_MATCH], separators=(",", ":"), sort_keys=True).encode() + b"\n"
+
+
+class TagIndex:
+    """Finds the spots whose tags match an item by bidirectional substring.
+
+    A tag matches when it occurs inside the item or the item occurs inside
+    it, the same rule match_spots has always used. "Tag in item" is answered
+    by hashing every substring of the item no longer than the longest tag
+    against the tag table, so it stays linear in the item's length.
+    "Item in tag" intersects trigram postings of the tag vocabulary and then
+    verifies the survivors; items shorter than a trigram use a table of the
+    1- and 2-character substrings of every tag instead. Neither path walks
+    the catalog, so lookups cost the same for five spots or five thousand.
+
+    Synonyms are indexed as extra terms that post to the same spots as the
+    tag they stand for, but they only match whole words of the item: the
+    substring tables hold tags alone, so "ring" cannot find keyring or
+    "car" scarf through a synonym.
+    """
+
+    def __init__(self, tag_lists, synonyms=None):
+        self.postings = {}
+        self.grams = {}
+        self.short = {}
+        for spot_id, tags in enumerate(tag_lists):
+            for tag in tags:
+                self.postings.setdefault(tag, []).append(spot_id)
+        self.tags = frozenset(self.postings)
+        aliases = {}
+        for tag, words in (synonyms or {}).items():
+            for word in words:
+                aliases.setdefault(word, set()).update(self.postings.get(tag, ()))
+        for word, ids in aliases.items():
+            if ids:
+                self.postings[word] = sorted(ids.union(self.postings.get(word, ())))
+        self.aliases = frozenset(self.postings).difference(self.tags)
+        for tag in self.tags:
+            for n in (1, 2):
+                for i in range(len(tag) - n + 1):
+                    self.short.setdefault(tag[i:i + n], set()).add(tag)
+            for gram in _trigrams(tag):
+                self.grams.setdefault(gram, set()).add(tag)
+        self.postings = {tag: tuple(ids) for tag, ids in self.postings.items()}
+        self.max_length = max(map(len, self.tags), default=0)
+        self.max_words = max((len(alias.split()) for alias in self.aliases), default=0)
+
+    def matching_tags(self, item):
+        """Return the tags that contain, or are contained in, item, and the synonyms among its words."""
+        if not item:
+            return set(self.postings)
+        tags = set()
+        words = item.split()
+        for i in range(len(words)):
+            for j in range(i + 1, min(len(words), i + self.max_words) + 1):
+                phrase = " ".join(words[i:j])
+                if phrase in self.aliases:
+                    tags.add(phrase)
+        for i in range(len(item)):
+            for j in range(i + 1, min(len(item), i + self.max_length) + 1):
+                if item[i:j] in self.tags:
+                    tags.add(item[i:j])
+        if len(item) > self.max_length:
+            return tags
+        if len(item) < 3:
+            tags.update(self.short.get(item, ()))
+            return tags
+        candidates = sorted((self.grams.get(g, set()) for g in _trigrams(item)), key=len)
+        if candidates and candidates[0]:
+            for tag in candidates[0].intersection(*candidates[1:]):
+                if item in tag:
+                    tags.add(tag)
+        return tags
+
+    def lookup(self, item):
+        """Return the ids of spots with a matching tag, in catalog order."""
+        ids = set()
+        for tag in self.matching_tags(item):
+            ids.update(self.postings[tag])
+        return sorted(ids)
+
+
+class FuzzyIndex:
+    """Typo-tolerant term lookup using a SymSpell-style deletion dictionary.
+
+    Every term is indexed under all the strings reachable from its first
+    prefix_length characters by deleting up to max_distance characters. A
+    query generates its own deletes and only the terms sharing one of them
+    are checked with a bounded edit distance, so a lookup never compares
+    the query against the whole vocabulary.
+    """
+
+    def __init__(self, terms, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.deletes = {}
+        for term in terms:
+            for variant in _deletes(term[:prefix_length], max_distance):
+                self.deletes.setdefault(variant, []).append(term)
+
+    def allowed_distance(self, item):
+        """Return how many edits to tolerate for an item of this length."""
+        if len(item) < 3:
+            return 0
+        if len(item) <= 4:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, item):
+        """Return the closest terms within the allowed edit distance."""
+        limit = self.allowed_distance(item)
+        if not limit:
+            return []
+        best = limit + 1
+        found = []
+        seen = set()
+        for variant in _deletes(item[:self.prefix_length], limit):
+            for term in self.deletes.get(variant, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                distance = _edit_distance(item, term, limit)
+                if distance > limit:
+                    continue
+                if distance < best:
+                    best = distance
+                    found = [term]
+                elif distance == best:
+                    found.append(term)
+        return found
+
+
+class TermAutomaton:
+    """Aho-Corasick automaton that finds every catalog term in a text.
+
+    Built once from all tags and synonyms, it reports each term occurring
+    in the text in a single left-to-right scan, however many terms there
+    are, including multi-word ones such as "student id". Matches inside a
+    longer word ("key" in "monkey") are dropped by a word-boundary check.
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        outputs = [[]]
+        for term in terms:
+            node = 0
+            for ch in term:
+                child = self.goto[node].get(ch)
+                if child is None:
+                    child = self.goto[node][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    outputs.append([])
+                node = child
+            outputs[node].append(term)
+        pending = deque(self.goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self.goto[node].items():
+                pending.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                outputs[child].extend(outputs[self.fail[child]])
+        self.outputs = [tuple(terms) for terms in outputs]
+
+    def find(self, text):
+        """Return the terms occurring in text as whole words, in order of appearance.
+
+        A term found only inside a longer match ("id" in "student id") is
+        left out; the longer term already covers it.
+        """
+        spans = []
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for term in self.outputs[node]:
+                start = end - len(term)
+                if ((start == 0 or not text[start - 1].isalnum())
+                        and (end == len(text) or not text[end].isalnum())):
+                    spans.append((start, -end, term))
+        found = []
+        reach = 0
+        for start, end, term in sorted(spans):
+            if -end > reach:
+                reach = -end
+                if term not in found:
+                    found.append(term)
+        return found
+
+
+class Catalog:
+    """Compiled, read-only view of the spots catalog.
+
+    A Catalog is never mutated after construction (apart from memoizing
+    serialized results); reloads build a new one and swap it in, so a
+    request holding a reference always sees a complete set of indexes.
+
+    Each spot is serialized once at load time, and every term's spots are
+    pre-ranked for every area. A request that resolves to a single term is
+    then one dict lookup, with the response body built on first use and
+    reused after that.
+
+    Ranking follows walking distance between areas. The optional distances
+    graph (area -> {neighbouring area: minutes}) is closed into all-pairs
+    shortest distances when the catalog loads, and for each area the other
+    areas are numbered by how far away they are. Ranking a result is then a
+    bucket pass over the matched spots, never a sort. Without a graph every
+    other area is equally far, which keeps the user's own area first and
+    everything else in catalog order.
+    """
+
+    def __init__(self, spots, synonyms=None, semantic=None, distances=None):
+        self.spots = spots
+        self.synonyms = synonyms or {}
+        self.distances = distances or {}
+        self.names = list(spots)
+        self.version = hashlib.sha1(
+            json.dumps([spots, self.synonyms, self.distances], sort_keys=True).encode()
+        ).hexdigest()[:12]
+        self.index = TagIndex([spots[name]["tags"] for name in self.names], self.synonyms)
+        self.fuzzy = FuzzyIndex(self.index.postings)
+        self.semantic = semantic.index(list(self.index.postings)) if semantic else None
+        # Synonym -> the tag it stands for
+        self.canonical = {word: tag for tag, words in self.synonyms.items() for word in words}
+        self.automaton = TermAutomaton(self.index.postings)
+        names = {spot["area"] for spot in spots.values()} | set(self.distances)
+        for neighbours in self.distances.values():
+            names.update(neighbours)
+        # Area -> row/column in the distance matrix
+        self.areas = {area: i for i, area in enumerate(sorted(names))}
+        self.spot_areas = array("H", (self.areas[spots[name]["area"]] for name in self.names))
+        self.distance = _all_pairs(len(self.areas), [
+            (self.areas[a], self.areas[b], minutes)
+            for a, neighbours in self.distances.items() for b, minutes in neighbours.items()
+        ])
+        # For each area, the proximity rank of every area (0 = itself);
+        # areas at the same distance share a rank so ties keep catalog order
+        self.proximity = []
+        n = len(self.areas)
+        for i in range(n):
+            row = self.distance[i * n:(i + 1) * n]
+            steps = {d: rank for rank, d in enumerate(sorted(set(row)))}
+            self.proximity.append(array("H", (steps[d] for d in row)))
+        self.entries = [
+            {"name": name, "link": spots[name]["link"], "area": spots[name]["area"]}
+            for name in self.names
+        ]
+        self.fragments = [_serialize(entry) for entry in self.entries]
+        self.ranked = {
+            term: {area: tuple(self.rank(ids, area)) for area in self.areas}
+            for term, ids in self.index.postings.items()
+        }
+        self._bodies = {}
+        # Built here so it is serialized and compressed once per reload
+        self.snapshot = Asset("catalog.json", _serialize(self.export()))
+
+    def export(self):
+        """Return the compact form of the catalog served by /catalog.
+
+        Spots are [name, link, area] rows; terms (tags and synonyms) map to
+        row numbers; proximity[i] ranks every area by distance from areas[i].
+        A client can answer an item that is exactly a term, ordered as the
+        server would; substring, typo and semantic matching are not part of
+        the export, so anything else still has to go to /lost-found.
+        """
+        return {
+            "version": self.version,
+            "spots": [[e["name"], e["link"], e["area"]] for e in self.entries],
+            "terms": {term: list(ids) for term, ids in self.index.postings.items()},
+            "areas": list(self.areas),
+            "spot_areas": list(self.spot_areas),
+            "proximity": [list(row) for row in self.proximity],
+            "no_match": NO_MATCH,
+        }
+
+    def matching_terms(self, item, matcher=None):
+        """Return the terms matching item under matcher (see matchers.py).
+
+        The default tries substrings, then the nearest typo, then (when a
+        semantic engine is configured) embedding similarity.
+        """
+        return (matcher or DEFAULT_MATCHER).terms(self, item)
+
+    def lookup(self, item, matcher=None):
+        """Return the ids of spots matching item, in catalog order."""
+        return self._spot_ids(self.matching_terms(item, matcher))
+
+    def lookup_many(self, items, matcher=None):
+        """Return the ids of spots matching any of items, in catalog order."""
+        terms = set()
+        for item in items:
+            terms.update(self.matching_terms(item.lower(), matcher))
+        return self._spot_ids(terms)
+
+    def find_items(self, text):
+        """Return every catalog term named in text, in order of appearance."""
+        return self.automaton.find(text.lower())
+
+    def rank(self, spot_ids, user_area):
+        """Order spot ids nearest to the user's area first, keeping catalog order on ties."""
+        origin = self.areas.get(user_area)
+        if origin is None:
+            return list(spot_ids)
+        proximity = self.proximity[origin]
+        buckets = [[] for _ in range(max(proximity) + 1)]
+        for i in spot_ids:
+            buckets[proximity[self.spot_areas[i]]].append(i)
+        return [i for bucket in buckets for i in bucket]
+
+    def results(self, item, user_area, matcher=None):
+        """Return (body, etag) for the ranked matches of item as JSON bytes."""
+        terms = self.matching_terms(item.lower(), matcher)
+        area = user_area if user_area in self.areas else None
+        if len(terms) != 1:
+            return self._render(self.rank(self._spot_ids(terms), user_area))
+        key = (terms.pop(), area)
+        result = self._bodies.get(key)
+        if result is None:
+            ranked = self.ranked[key[0]].get(area, self.index.postings[key[0]])
+            result = self._bodies[key] = self._render(ranked)
+        return result
+
+    def results_many(self, items, user_area, matcher=None):
+        """Return (body, etag) for the merged, deduplicated matches of items."""
+        if len(items) == 1:
+            return self.results(items[0], user_area, matcher)
+        return self._render(self.rank(self.lookup_many(items, matcher), user_area))
+
+    def _spot_ids(self, terms):
+        ids = set()
+        for term in terms:
+            ids.update(self.index.postings[term])
+        return sorted(ids)
+
+    def _render(self, spot_ids):
+        if spot_ids:
+            body = b"[" + b",".join(self.fragments[i] for i in spot_ids) + b"]\n"
+        else:
+            body = NO_MATCH_BODY
+        return body, hashlib.sha1(body).hexdigest()[:20]
+
+
+def load_catalog(path, semantic=None):
+    """Read a spots catalog file and compile it into a Catalog."""
+    with open(path) as f:
+        data = json.load(f)
+    spots = data.get("spots") if isinstance(data, dict) else None
+    if not isinstance(spots, dict):
+        raise ValueError(f"{path}: expected an object with a \"spots\" mapping")
+    for name, spot in spots.items():
+        if (not isinstance(spot, dict) or not isinstance(spot.get("tags"), list)
+                or not isinstance(spot.get("link"), str) or not isinstance(spot.get("area"), str)):
+            raise ValueError(f"{path}: spot {name!r} needs \"tags\", \"link\" and \"area\"")
+    synonyms = data.get("synonyms", {})
+    if not isinstance(synonyms, dict) or not all(isinstance(v, list) for v in synonyms.values()):
+        raise ValueError(f"{path}: \"synonyms\" must map tags to lists of words")
+    distances = data.get("distances", {})
+    if not isinstance(distances, dict) or not all(
+            isinstance(neighbours, dict) and all(
+                isinstance(d, (int, float)) and not isinstance(d, bool) and d >= 0
+                for d in neighbours.values())
+            for neighbours in distances.values()):
+        raise ValueError(f"{path}: \"distances\" must map areas to {{area: minutes}} objects")
+    return Catalog(spots, synonyms, semantic, distances)
+
+
+class CatalogStore:
+    """Holds the live Catalog and hot-reloads it when the file changes.
+
+    A background thread polls the file's mtime and size. When either
+    changes, the new catalog is fully compiled off to the side and then
+    published with a single reference assignment. A catalog that fails to
+    load is logged and the previous one stays in service.
+    """
+
+    def __init__(self, path, interval=5.0, semantic=None):
+        self.path = path
+        self.interval = interval
+        self.semantic = semantic
+        self._stamp = self._stat()
+        self.current = load_catalog(path, semantic)
+        self._pid = None
+
+    def reload(self):
+        """Rebuild and swap in the catalog if the file has changed."""
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return False
+        try:
+            catalog = load_catalog(self.path, self.semantic)
+        except Exception as e:
+            logger.error(f"Error reloading catalog from {self.path}: {str(e)}")
+            return False
+        finally:
+            self._stamp = stamp
+        self.current = catalog
+        logger.info(f"Reloaded catalog {catalog.version} with {len(catalog.names)} spots")
+        return True
+
+    def start(self):
+        """Start the watcher thread once per process."""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._watch, name="catalog-watcher", daemon=True).start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.reload()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+
+def _serialize(obj):
+    # Byte-for-byte what Flask's jsonify produces outside debug mode
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode()
+
+
+def _all_pairs(n, edges):
+    """Dijkstra from every area over undirected edges; a flat n*n array of distances.
+
+    Walking graphs are sparse, so n heap-based runs cost O(n * e log n)
+    rather than Floyd-Warshall's O(n^3).
+    """
+    inf = float("inf")
+    neighbours = [{} for _ in range(n)]
+    for a, b, d in edges:
+        if a != b and d < neighbours[a].get(b, inf):
+            neighbours[a][b] = neighbours[b][a] = float(d)
+    neighbours = [list(adjacent.items()) for adjacent in neighbours]
+    dist = array("d")
+    for source in range(n):
+        best = [inf] * n
+        best[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > best[i]:
+                continue
+            for j, step in neighbours[i]:
+                if d + step < best[j]:
+                    best[j] = d + step
+                    heapq.heappush(heap, (d + step, j))
+        dist.extend(best)
+    return dist
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _deletes(word, distance):
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(row[j] + 1, current[j - 1] + 1, row[j - 1] + cost)
+            if (previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous, row = row, current
+    return row[-1] if row[-1] <= limit else limit + 1
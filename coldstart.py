@@ -0,0 +1,84 @@
+"""Report where cold-start time goes when app.py is imported.
+
+Imports the app in a fresh interpreter with -X importtime, the way a new
+Cloud Run instance or gunicorn master would, and prints import time per
+top-level package, the slowest individual modules, and the wall time of
+the whole import and of warmup() within it:
+
+    python coldstart.py --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_s": elapsed, "warmup_s": app.warmup_seconds}))
+"""
+
+
+def parse_importtime(lines):
+    """Return [(module, self_us, cumulative_us)] from -X importtime output."""
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return modules
+
+
+def profile():
+    """Import the app in a subprocess; return (modules, timings)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"importing app failed:\n{result.stderr}")
+    # Timings go to stdout; stderr carries the importtime lines and app logs
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return parse_importtime(result.stderr.splitlines()), timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help='rows per table (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    modules, timings = profile()
+    packages = {}
+    for name, self_us, _ in modules:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    report = {
+        "import_ms": timings.get("import_s", 0) * 1000,
+        "warmup_ms": timings.get("warmup_s", 0) * 1000,
+        "modules_imported": len(modules),
+        "packages": [{"package": name, "ms": us / 1000}
+                     for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]],
+        "slowest_modules": [{"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative / 1000}
+                            for name, self_us, cumulative in sorted(modules, key=lambda m: -m[2])[:args.top]],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"import app: {report['import_ms']:.1f} ms "
+          f"(warmup {report['warmup_ms']:.1f} ms, {report['modules_imported']} modules)")
+    print("\nimport time by top-level package (self time, ms)")
+    for row in report["packages"]:
+        print(f"  {row['ms']:8.1f}  {row['package']}")
+    print("\nslowest modules (cumulative ms, self ms)")
+    for row in report["slowest_modules"]:
+        print(f"  {row['cumulative_ms']:8.1f}  {row['self_ms']:8.1f}  {row['module']}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
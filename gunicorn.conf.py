@@ -0,0 +1,34 @@
+import os
+
+# Gunicorn picks this file up automatically when started from the repo root.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+
+# Every open /lost-found/stream connection holds its worker's request slot
+# for as long as the client stays. When streaming is enabled (FOUND_DB_PATH
+# set) workers run gevent, where an idle stream is a parked greenlet of a
+# few KB, so each worker holds up to worker_connections of them; otherwise
+# gthread serves lookups. A sync worker would serve one request at a time;
+# the app refuses streams there rather than let a dashboard block every
+# other request.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent' if os.environ.get('FOUND_DB_PATH') else 'gthread')
+# gunicorn turns sync into gthread whenever threads > 1, so only gthread
+# gets the larger default
+threads = int(os.environ.get('GUNICORN_THREADS', '100' if worker_class == 'gthread' else '1'))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '1000'))
+if worker_class == 'gevent':
+    # Leave a tenth of the connections for lookups beside the streams
+    os.environ.setdefault('STREAM_MAX_SUBSCRIBERS', str(worker_connections * 9 // 10))
+# Seconds a worker may go silent before the master restarts it
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+# Import app.py once in the master so the NLP pipeline is loaded a single
+# time and shared copy-on-write by every forked worker.
+preload_app = True
+
+
+def post_worker_init(worker):
+    # Threads do not survive fork, so each worker starts its own; this runs
+    # after a gevent worker has monkey-patched, so they become greenlets.
+    import app
+    app.start_background_tasks()
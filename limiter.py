@@ -0,0 +1,54 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimiter:
+    """Per-client token buckets plus a global cap on in-flight requests.
+
+    Each client key gets a bucket holding up to burst tokens that refills
+    at rate tokens per second; a request spends cost tokens or is refused
+    with the number of seconds until it could succeed. Buckets live in a
+    bounded LRU table so a flood of distinct clients cannot grow memory
+    without limit. The concurrency cap is a non-blocking semaphore: when
+    every slot is taken the request is refused immediately instead of
+    queueing behind the others.
+    """
+
+    def __init__(self, rate=10.0, burst=20.0, max_clients=10000, max_concurrent=0):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+
+    def check(self, key, cost=1):
+        """Spend cost tokens from key's bucket; return 0 or seconds to wait."""
+        if self.rate <= 0:
+            return 0.0
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / self.rate
+
+    def enter(self):
+        """Take a concurrency slot without waiting; False if none is free."""
+        return self._slots is None or self._slots.acquire(blocking=False)
+
+    def leave(self):
+        """Release a slot taken by enter()."""
+        if self._slots is not None:
+            self._slots.release()
@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with fields from extra= as top-level keys.
+
+    Uses "severity" and "message" so Cloud Logging picks up the level and
+    text without further configuration.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                    + f".{int(record.msecs):03d}Z",
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting happens on the listener thread, not the request thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of INFO-and-below records; warnings always pass."""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.INFO or self.rate >= 1 or random.random() < self.rate
+
+
+class AsyncLogging:
+    """Routes all logging through a bounded queue to a background writer.
+
+    Request threads only pay for a put_nowait; a listener thread formats the
+    records as JSON and writes them to stderr. Threads do not survive fork,
+    so start() must be called again in every forked worker; the child gets
+    a fresh queue rather than sharing state with the parent's thread.
+    """
+
+    def __init__(self, level=logging.INFO, maxsize=10000, stream=None):
+        self.maxsize = maxsize
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize))
+        self.output = logging.StreamHandler(stream or sys.stderr)
+        self.output.setFormatter(JSONFormatter())
+        self.listener = None
+        self._pid = None
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+
+    def start(self):
+        """Start the writer thread once per process."""
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            self.handler.queue = queue.Queue(self.maxsize)
+        self._pid = os.getpid()
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
@@ -0,0 +1,148 @@
+import abc
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Matcher(abc.ABC):
+    """Maps an extracted item to the catalog terms (tags or synonyms) it matches.
+
+    Engines only decide which terms match; the catalog turns terms into
+    spots and ranks them, so every engine shares the same indexes and
+    serialized results.
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def terms(self, catalog, item):
+        """Return the set of catalog terms item matches."""
+
+
+class ExactMatcher(Matcher):
+    """The item must be a tag or synonym as written."""
+
+    name = "exact"
+
+    def terms(self, catalog, item):
+        return {item} if item in catalog.index.postings else set()
+
+
+class SubstringMatcher(Matcher):
+    """A tag matches when either contains the other; a synonym must be a word of the item."""
+
+    name = "substring"
+
+    def terms(self, catalog, item):
+        return catalog.index.matching_tags(item)
+
+
+class FuzzyMatcher(SubstringMatcher):
+    """Substring matches, else the nearest terms within a few typos."""
+
+    name = "fuzzy"
+
+    def terms(self, catalog, item):
+        return super().terms(catalog, item) or set(catalog.fuzzy.lookup(item))
+
+
+class SemanticMatcher(FuzzyMatcher):
+    """Fuzzy matches, else the terms closest in word-vector space."""
+
+    name = "semantic"
+
+    def terms(self, catalog, item):
+        terms = super().terms(catalog, item)
+        if not terms and catalog.semantic is not None:
+            terms = set(catalog.semantic.nearest(item))
+        return terms
+
+
+ENGINES = {cls.name: cls for cls in (ExactMatcher, SubstringMatcher, FuzzyMatcher, SemanticMatcher)}
+
+
+def get_matcher(name):
+    """Return a matcher instance for an engine name."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown match engine {name!r}; expected one of {tuple(ENGINES)}")
+    return ENGINES[name]()
+
+
+class Shadow:
+    """Runs a candidate engine beside the primary on sampled live queries.
+
+    Sampled (catalog, items) pairs are queued without blocking and a
+    background thread runs both engines on them, so the request path only
+    pays for the sampling decision. Each engine's lookup time is observed
+    on the latency histogram by engine name, and the outcome of comparing
+    the two spot sets ("same", "superset", "subset" or "different") is
+    counted on outcomes. When the queue is full the sample is dropped.
+    """
+
+    def __init__(self, primary, candidate, sample_rate, latency, outcomes, maxsize=1000):
+        self.primary = primary
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.latency = latency
+        self.outcomes = outcomes
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._pid = None
+
+    def offer(self, catalog, items):
+        """Queue a live query for comparison if it is sampled."""
+        if random.random() >= self.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((catalog, items))
+        except queue.Full:
+            self.dropped += 1
+
+    def compare(self, catalog, items):
+        """Run both engines on items; return (outcome, primary ids, candidate ids)."""
+        found = []
+        for matcher in (self.primary, self.candidate):
+            start = time.perf_counter()
+            ids = set(catalog.lookup_many(items, matcher))
+            self.latency.observe(time.perf_counter() - start, matcher.name)
+            found.append(ids)
+        primary, candidate = found
+        if primary == candidate:
+            outcome = "same"
+        elif candidate > primary:
+            outcome = "superset"
+        elif candidate < primary:
+            outcome = "subset"
+        else:
+            outcome = "different"
+        self.outcomes.inc(self.candidate.name, outcome)
+        return outcome, primary, candidate
+
+    def start(self):
+        """Start the comparison thread once per process."""
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            self._queue = queue.Queue(self.maxsize)
+        self._pid = os.getpid()
+        threading.Thread(target=self._run, name="shadow-matcher", daemon=True).start()
+
+    def _run(self):
+        while True:
+            catalog, items = self._queue.get()
+            try:
+                outcome, primary, candidate = self.compare(catalog, items)
+                if outcome != "same":
+                    logger.info("Shadow engine differs", extra={
+                        'items': list(items), 'outcome': outcome, 'engine': self.candidate.name,
+                        'primary': sorted(catalog.names[i] for i in primary),
+                        'candidate': sorted(catalog.names[i] for i in candidate),
+                    })
+            except Exception as e:
+                logger.error(f"Error in shadow matcher: {str(e)}")
@@ -0,0 +1,243 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def values(self):
+        """Return {labelvalues: value} for this process."""
+        with self._lock:
+            return dict(self._values)
+
+    def combine(self, values, labelvalues, value):
+        """Add another process's value for labelvalues into values."""
+        values[labelvalues] = values.get(labelvalues, 0) + value
+
+    def samples(self, values=None):
+        values = self.values() if values is None else values
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, _labels(self.labelnames, labelvalues), value
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds, in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def values(self):
+        """Return {labelvalues: [bucket counts, sum]} for this process."""
+        with self._lock:
+            return {k: [list(counts), total] for k, (counts, total) in self._series.items()}
+
+    def combine(self, values, labelvalues, value):
+        """Add another process's bucket counts and sum for labelvalues into values."""
+        counts, total = value
+        series = values.get(labelvalues)
+        if series is None:
+            values[labelvalues] = [list(counts), total]
+        elif len(counts) == len(series[0]):
+            series[0] = [a + b for a, b in zip(series[0], counts)]
+            series[1] += total
+
+    def samples(self, values=None):
+        values = self.values() if values is None else values
+        for labelvalues, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield (self.name + "_bucket",
+                       _labels(self.labelnames + ("le",), labelvalues + (le,)), cumulative)
+            yield self.name + "_sum", _labels(self.labelnames, labelvalues), total
+            yield self.name + "_count", _labels(self.labelnames, labelvalues), cumulative
+
+
+class CallbackGauge:
+    """Gauge or counter whose value is read from a function at scrape time."""
+
+    def __init__(self, name, documentation, fn, kind="gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.fn = fn
+
+    def values(self):
+        return {(): self.fn()}
+
+    def combine(self, values, labelvalues, value):
+        values[labelvalues] = values.get(labelvalues, 0) + value
+
+    def samples(self, values=None):
+        values = self.values() if values is None else values
+        for value in values.values():
+            yield self.name, "", value
+
+
+class Registry:
+    """Ordered collection of metrics rendered in the Prometheus text format.
+
+    Recording is a dict lookup, a bisect and a locked increment, cheap
+    enough to leave on in production. With a directory, a background
+    thread in every process writes its values there as JSON every interval
+    seconds, and render() adds the other processes' files to its own live
+    values, so whichever gunicorn worker answers a scrape reports the
+    whole instance. Counters and histograms from workers that have exited
+    stay in the sum, keeping totals monotonic across worker restarts;
+    gauges are only taken from files written in the last three intervals.
+    """
+
+    def __init__(self, directory=None, interval=5.0):
+        self.metrics = []
+        self.directory = directory
+        self.interval = interval
+        self._pid = None
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def snapshot(self):
+        """Return this process's values as a JSON-serializable dict."""
+        return {
+            "pid": os.getpid(),
+            "time": time.time(),
+            "metrics": {metric.name: [[list(k), v] for k, v in metric.values().items()]
+                        for metric in self.metrics},
+        }
+
+    def flush(self):
+        """Write this process's snapshot, replacing its previous one atomically."""
+        if not self.directory or self._pid != os.getpid():
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path + ".tmp", path)
+        return path
+
+    def collect(self):
+        """Return {metric name: values} summed over this process and the others' snapshots."""
+        merged = {metric.name: metric.values() for metric in self.metrics}
+        now = time.time()
+        for snapshot in self._load_snapshots():
+            fresh = now - snapshot.get("time", 0) <= 3 * self.interval
+            for metric in self.metrics:
+                if metric.kind == "gauge" and not fresh:
+                    continue
+                for labelvalues, value in snapshot.get("metrics", {}).get(metric.name, ()):
+                    metric.combine(merged[metric.name], tuple(labelvalues), value)
+        return merged
+
+    def render(self):
+        merged = self.collect()
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples(merged[metric.name]):
+                lines.append(f"{name}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Start the flush thread once per process."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        if self.directory and self.interval > 0:
+            threading.Thread(target=self._run, name="metrics-flush", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing metrics: {str(e)}")
+
+    def _load_snapshots(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name == f"metrics-{os.getpid()}.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+
+def summarize(samples, elapsed):
+    """Throughput and latency percentiles (microseconds) for timed samples."""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1e6
+
+    return {
+        "count": len(ordered),
+        "ops_per_sec": len(ordered) / elapsed if elapsed else 0.0,
+        "mean_us": sum(ordered) / len(ordered) * 1e6,
+        "p50_us": pct(50),
+        "p95_us": pct(95),
+        "p99_us": pct(99),
+    }
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
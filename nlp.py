@@ -0,0 +1,194 @@
+import logging
+import re
+import sys
+
+logger = logging.getLogger(__name__)
+
+# A single-pass tokenizer that reproduces NLTK's Treebank word tokenizer
+# (what word_tokenize runs after sentence splitting) on the short phrases
+# users type: clitics and n't split off, "cannot"/"gonna" style contractions
+# split, hyphens, slashes and inner periods kept, numbers like 1,000 and
+# 10:30 kept whole, and only the phrase-final period split off.
+_WORD_CHAR = r"""[^\s,;:@#$%&?!()\[\]{}<>"'`.*]"""
+_WORD_PART = rf"""(?:(?!--){_WORD_CHAR}|\.(?!\.\.)|[,:](?=\d))"""
+_FINAL_PERIOD_RE = re.compile(r"""([^\.])(\.)([\]\)}>"\']*)\s*$""")
+_TOKEN_RE = re.compile(rf"""
+    \b(?:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na(?:\s|$)))
+  | {_WORD_CHAR}+?(?=n't\b) | n't\b
+  | '(?:s|m|d|ll|re|ve)\b
+  | '*{_WORD_PART}(?:{_WORD_PART}|'(?!(?:s|m|d|ll|re|ve)\b)(?={_WORD_CHAR}))*
+  | \.\.\. | -- | `` | ''
+  | [^\w\s]
+""", re.VERBOSE | re.IGNORECASE)
+
+ITEM_MARKERS = ["lost", "my"]
+SKIP_AFTER_MARKER = ["my", "near", "at", "in", "the"]
+STOPWORDS = ["i", "lost", "my", "near", "at", "in", "the"]
+# Words that end the description of an item ("wallet near the library")
+PHRASE_BREAKS = ["near", "at", "in", "on", "by", "from", "with", "and", "or", "is", "was", "are", "that",
+                 "somewhere", "today", "yesterday", "last", "this"]
+
+# Phrases the regex and NLTK engines must extract the same item from
+PARITY_CORPUS = [
+    "I lost my phone",
+    "lost my keys near the library",
+    "I lost my wallet.",
+    "my wallet is gone",
+    "Lost my laptop in the library!",
+    "I can't find my backpack",
+    "I think I've lost my catcard at the rec",
+    "lost my e-reader somewhere",
+    "lost my laptop/charger in class",
+    "I lost my AirPods case near the union",
+    "lost my \"lucky\" hoodie",
+    "lost my keys, wallet and phone",
+    "my friend's bike is missing",
+    "lost my iPad's charger",
+    "lost $20 near the bookstore",
+    "lost my keys at 10:30 this morning",
+    "I lost 1,000 dollars worth of gear",
+    "lost my 3.5 inch drive",
+    "cannot find my helmet",
+    "i'm gonna need my notebook back",
+    "Lost: black umbrella",
+    "lost my glasses (the red ones)",
+    "keys",
+    "phone?",
+    "lost lost lost",
+    "near the library",
+    "I lost my ID card at the Student Union...",
+    "where did my skateboard go?!",
+    "lost my jacket -- the blue one",
+    "the dorm key",
+    "LOST MY WATER BOTTLE",
+    "I lost my mom's ring",
+    "we'll need our textbooks",
+    "lost my u.s. passport",
+    "lost my 'good' headphones",
+    "lost my earbuds & charger",
+    "lost my notebook; please help",
+    "lost my calculator at the 2nd floor",
+]
+
+
+def regex_tokenize(text):
+    """Split text into Treebank-style word tokens with one compiled regex."""
+    text = _FINAL_PERIOD_RE.sub(r"\1 \2\3 ", text)
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        if token == '"':
+            start = match.start()
+            token = "``" if start == 0 or text[start - 1] in " ([{<" else "''"
+        tokens.append(token)
+    return tokens
+
+
+def item_from_tokens(tokens):
+    """Pick the lost item out of a token list, or None if there is none."""
+    for i, token in enumerate(tokens):
+        if token in ITEM_MARKERS and i + 1 < len(tokens):
+            next_token = tokens[i + 1]
+            if next_token not in SKIP_AFTER_MARKER:
+                return next_token
+    for token in tokens:
+        if token.isalnum() and token not in STOPWORDS:
+            return token
+    return None
+
+
+def item_phrase(tokens):
+    """Return the words describing the lost item, without markers or stopwords.
+
+    The phrase starts after the first item marker (or at the beginning) and
+    ends at a location word, conjunction or punctuation, so its last word is
+    the item itself: "lost my red water bottle near the rec" gives
+    ["red", "water", "bottle"].
+    """
+    start = next((i + 1 for i, token in enumerate(tokens) if token in ITEM_MARKERS), 0)
+    words = []
+    for token in tokens[start:]:
+        if token in ("``", "''"):
+            continue
+        if token in PHRASE_BREAKS or not any(ch.isalnum() for ch in token):
+            if words:
+                break
+        elif not token.startswith("'") and token not in STOPWORDS:
+            words.append(token)
+    return words
+
+
+class NLPPipeline:
+    """Tokenizer state loaded once per process and shared by forked workers.
+
+    The default "regex" engine needs no data files and no NLTK import. The
+    "nltk" engine imports NLTK lazily and uses word_tokenize.
+    """
+
+    ENGINES = ("regex", "nltk")
+
+    def __init__(self, engine="regex"):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown tokenizer engine {engine!r}; expected one of {self.ENGINES}")
+        self.engine = engine
+        self.ready = False
+        self.preserve_line = False
+        self._word_tokenize = None
+
+    def load(self):
+        """Prepare the engine; for NLTK, make sure punkt is available."""
+        if self.ready:
+            return self
+        if self.engine == "nltk":
+            self._load_nltk()
+        self.ready = True
+        logger.info(f"NLP pipeline ready ({self.engine} tokenizer)")
+        return self
+
+    def tokenize(self, text):
+        """Split text into word tokens."""
+        if not self.ready:
+            self.load()
+        if self.engine == "regex":
+            return regex_tokenize(text)
+        return self._word_tokenize(text, preserve_line=self.preserve_line)
+
+    def _load_nltk(self):
+        import nltk
+        from nltk.tokenize import word_tokenize
+        self._word_tokenize = word_tokenize
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            logger.info("punkt not found locally, downloading")
+            nltk.download('punkt', quiet=True)
+        try:
+            # Loads the punkt pickle into nltk's resource cache so gunicorn
+            # workers forked after preload inherit it instead of reloading.
+            word_tokenize("warmup")
+        except LookupError:
+            logger.warning("punkt unavailable, tokenizing without sentence splitting")
+            self.preserve_line = True
+
+
+def check_parity(corpus=PARITY_CORPUS):
+    """Return (text, regex item, nltk item) for every phrase where they differ."""
+    fast = NLPPipeline("regex").load()
+    reference = NLPPipeline("nltk").load()
+    mismatches = []
+    for text in corpus:
+        expected = item_from_tokens(reference.tokenize(text.lower()))
+        actual = item_from_tokens(fast.tokenize(text.lower()))
+        if actual != expected:
+            mismatches.append((text, actual, expected))
+    return mismatches
+
+
+if __name__ == '__main__':
+    # python nlp.py: verify the regex tokenizer against NLTK on PARITY_CORPUS
+    logging.basicConfig(level=logging.WARNING)
+    mismatches = check_parity()
+    for text, actual, expected in mismatches:
+        print(f"MISMATCH {text!r}: regex={actual!r} nltk={expected!r}")
+    print(f"{len(PARITY_CORPUS) - len(mismatches)}/{len(PARITY_CORPUS)} phrases agree")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,128 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Control file in the profile directory holding the runtime settings
+SETTINGS_FILE = "profiling.json"
+
+
+class RequestProfiler:
+    """Runs selected requests under cProfile and keeps the newest profiles.
+
+    A request is profiled when it is picked by sample_rate or explicitly
+    forced (the app forces it for authenticated admin requests). Profiles
+    are written as pstats files named <time>-<name>-<pid>.prof, and only
+    the newest keep files in directory are retained. sample_rate and
+    enabled can be changed at runtime; while the profiler is disabled the
+    request path pays for one attribute check.
+
+    Runtime changes are written to a control file in directory, and a
+    background thread in every process re-reads it when its mtime changes,
+    so a change made through one worker reaches them all. A control file
+    older than the profiler is left over from a previous run and ignored.
+    """
+
+    def __init__(self, directory, sample_rate=0.0, keep=50, enabled=True, interval=1.0):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.enabled = enabled
+        self.interval = interval
+        self.written = 0
+        self.settings_path = os.path.join(directory, SETTINGS_FILE)
+        self._since = time.time_ns()
+        self._stamp = None
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def sampled(self):
+        """Return True if this request should be profiled by sampling."""
+        return self.enabled and self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, name, fn, *args, **kwargs):
+        """Call fn under cProfile; return (result, path of the saved profile).
+
+        The path is None when the profile could not be written; fn's result
+        is returned all the same.
+        """
+        profile = cProfile.Profile()
+        result = profile.runcall(fn, *args, **kwargs)
+        path = os.path.join(self.directory, f"{time.time():.6f}-{name}-{os.getpid()}.prof")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError as e:
+            logger.error(f"Error writing profile {path}: {str(e)}")
+            return result, None
+        with self._lock:
+            self.written += 1
+            self._rotate()
+        return result, path
+
+    def configure(self, enabled=None, sample_rate=None):
+        """Change the settings here and in the control file other processes read."""
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self.settings_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"enabled": self.enabled, "sample_rate": self.sample_rate}, f)
+        os.replace(tmp, self.settings_path)
+        self._stamp = self._stat()
+
+    def refresh(self):
+        """Apply the control file's settings if it changed; return True if it did."""
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp or stamp[0] < self._since:
+            return False
+        try:
+            with open(self.settings_path) as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading profiler settings: {str(e)}")
+            return False
+        finally:
+            self._stamp = stamp
+        self.enabled = bool(settings.get("enabled", self.enabled))
+        self.sample_rate = float(settings.get("sample_rate", self.sample_rate))
+        return True
+
+    def start(self):
+        """Start the settings watcher thread once per process."""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        threading.Thread(target=self._watch, name="profiler-settings", daemon=True).start()
+
+    def profiles(self):
+        """Return the retained profile file names, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted((f for f in os.listdir(self.directory) if f.endswith(".prof")), reverse=True)
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.refresh()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.settings_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _rotate(self):
+        for name in self.profiles()[self.keep:]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
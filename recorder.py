@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+import queue
+import re
+import time
+from logging.handlers import QueueListener
+
+from logconfig import DroppingQueueHandler
+
+# Long digit runs (phone, student and card numbers) and email addresses
+_DIGITS_RE = re.compile(r"\d[\d\s().-]{5,}\d")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_CONTROL_RE = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def sanitize(text, max_length=200):
+    """Strip contact details and control characters from free text."""
+    text = _EMAIL_RE.sub("<email>", text)
+    text = _DIGITS_RE.sub("<number>", text)
+    return _CONTROL_RE.sub(" ", text)[:max_length]
+
+
+class TrafficRecorder:
+    """Appends sanitized /lost-found requests to a JSONL file for replay.
+
+    Each line is {"ts": unix time, "item": ..., "area": ...}. Like the
+    application log, lines go through a bounded queue to a writer thread,
+    so recording never adds file I/O to a request, and records are dropped
+    rather than blocking when the writer falls behind. Every worker appends
+    to the same file; each line is written with a single append.
+    """
+
+    def __init__(self, path, maxsize=10000):
+        self.path = path
+        self.maxsize = maxsize
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize))
+        self.output = logging.FileHandler(path, encoding="utf-8")
+        self.output.setFormatter(logging.Formatter("%(message)s"))
+        self.logger = logging.getLogger("traffic")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.listener = None
+        self._pid = None
+
+    def record(self, item, area):
+        self.logger.info(json.dumps({"ts": round(time.time(), 3), "item": sanitize(item), "area": sanitize(area)}))
+
+    def start(self):
+        """Start the writer thread once per process."""
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            self.handler.queue = queue.Queue(self.maxsize)
+        self._pid = os.getpid()
+        self.listener = QueueListener(self.handler.queue, self.output)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and stop the writer thread."""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self._pid = None
@@ -0,0 +1,126 @@
+"""Replay recorded /lost-found traffic against a running instance.
+
+Reads the JSONL file written when TRAFFIC_LOG_PATH is set and sends each
+request at its original offset, divided by --speed (0 sends as fast as the
+client threads allow). Prints throughput, latency percentiles, status
+counts and the error rate as JSON:
+
+    python replay.py traffic.jsonl --url http://localhost:8080 --speed 10
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import summarize
+
+
+def load_traffic(path, limit=None):
+    """Return recorded requests in timestamp order."""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and {"ts", "item", "area"} <= record.keys():
+                records.append(record)
+    records.sort(key=lambda r: r["ts"])
+    return records[:limit] if limit else records
+
+
+def send(url, record, due, timeout):
+    """Issue one request; return (status, seconds since it was due)."""
+    query = urllib.parse.urlencode({"item": record["item"], "area": record["area"]})
+    try:
+        with urllib.request.urlopen(f"{url}/lost-found?{query}", timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - due
+
+
+def replay(records, url, speed=1.0, concurrency=32, timeout=10.0):
+    """Send records on their original schedule scaled by speed.
+
+    Latency is measured from when a request was due, not from when a
+    client thread got to it, so a saturated server shows up as latency
+    instead of silently slowing the replay down.
+    """
+    results = []
+    lock = threading.Lock()
+
+    def task(record, due):
+        result = send(url, record, due, timeout)
+        with lock:
+            results.append(result)
+
+    start = time.perf_counter()
+    first = records[0]["ts"] if records else 0
+    with ThreadPoolExecutor(concurrency) as pool:
+        for record in records:
+            due = start + (record["ts"] - first) / speed if speed > 0 else time.perf_counter()
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(task, record, due)
+    elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    ok = [latency for status, latency in results if 200 <= status < 400]
+    errors = len(results) - len(ok)
+    report = {
+        "requests": len(results),
+        "elapsed_s": elapsed,
+        "statuses": statuses,
+        "errors": errors,
+        "error_rate": errors / len(results) if results else 0.0,
+    }
+    if ok:
+        report["latency"] = summarize(ok, elapsed)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='recorded traffic (JSONL)')
+    parser.add_argument('--url', default='http://localhost:8080',
+                        help='instance to replay against (default: %(default)s)')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='playback speed multiplier, 0 for unpaced (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help='client threads (default: %(default)s)')
+    parser.add_argument('--limit', type=int, help='replay only the first N requests')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    records = load_traffic(args.path, args.limit)
+    report = {
+        "source": args.path,
+        "url": args.url,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+        "recorded_s": records[-1]["ts"] - records[0]["ts"] if records else 0,
+        **replay(records, args.url.rstrip('/'), args.speed, args.concurrency),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
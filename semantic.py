@@ -0,0 +1,95 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticEngine:
+    """Word vectors for CPU-only semantic matching of items to catalog terms.
+
+    Vectors are read from a GloVe or word2vec style text file (a word
+    followed by its components on each line), normalized and stored as an
+    int8 matrix, a quarter of the float32 size; only directions matter for
+    cosine similarity, so no per-row scale is kept. With max_words=200000
+    and 300 dimensions that is about 60 MB, well inside a 1 GB instance.
+    """
+
+    def __init__(self, path, max_words=200000, quantize=True, top_k=3, min_score=0.5):
+        self.path = path
+        self.top_k = top_k
+        self.min_score = min_score
+        self.vocab = {}
+        chunks = []
+        rows = []
+        dim = None
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                parts = line.rstrip().split(" ")
+                if len(parts) <= 2:
+                    continue  # word2vec header or blank line
+                if dim is None:
+                    dim = len(parts) - 1
+                if len(parts) - 1 != dim or parts[0] in self.vocab:
+                    continue
+                self.vocab[parts[0]] = len(self.vocab)
+                rows.append(parts[1:])
+                if len(rows) == 10000:
+                    chunks.append(self._pack(rows, quantize))
+                    rows = []
+                if len(self.vocab) >= max_words:
+                    break
+        if rows:
+            chunks.append(self._pack(rows, quantize))
+        if not chunks:
+            raise ValueError(f"{path}: no word vectors found")
+        self.matrix = np.concatenate(chunks)
+        logger.info(f"Loaded {len(self.vocab)} word vectors ({self.matrix.nbytes // 2**20} MB) from {path}")
+
+    def vector(self, text):
+        """Return the unit-length mean vector of the words in text, or None."""
+        rows = [self.vocab[word] for word in text.split() if word in self.vocab]
+        if not rows:
+            return None
+        v = self.matrix[rows].astype(np.float32).mean(axis=0)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else None
+
+    def index(self, terms):
+        """Embed catalog terms once into a matrix for nearest() lookups."""
+        return SemanticIndex(self, terms)
+
+    @staticmethod
+    def _pack(rows, quantize):
+        block = np.asarray(rows, dtype=np.float32)
+        block /= np.maximum(np.linalg.norm(block, axis=1, keepdims=True), 1e-12)
+        if quantize:
+            return np.rint(block * 127).astype(np.int8)
+        return block
+
+
+class SemanticIndex:
+    """Unit vectors of one catalog's terms, ranked by a single matrix product."""
+
+    def __init__(self, engine, terms):
+        self.engine = engine
+        self.terms = []
+        vectors = []
+        for term in terms:
+            v = engine.vector(term)
+            if v is not None:
+                self.terms.append(term)
+                vectors.append(v)
+        dim = engine.matrix.shape[1]
+        self.matrix = np.vstack(vectors) if vectors else np.zeros((0, dim), dtype=np.float32)
+
+    def nearest(self, item):
+        """Return the engine's top_k terms scoring at least its min_score."""
+        query = self.engine.vector(item)
+        if query is None or not self.terms:
+            return []
+        scores = self.matrix @ query
+        k = min(self.engine.top_k, len(self.terms))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [self.terms[i] for i in best if scores[i] >= self.engine.min_score]
@@ -0,0 +1,78 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# The only files served to browsers; everything else in the repo stays private
+FRONTEND_FILES = ["index.html", "script.js", "style.css", "config.js"]
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+class Asset:
+    """One frontend file with its identity, gzip and brotli encodings."""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if self.mimetype.startswith("text/") or self.mimetype.endswith("javascript"):
+            self.mimetype += "; charset=utf-8"
+        self.digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        self.fingerprinted = f"{stem}.{self.digest}{ext}"
+        self.variants = {"identity": (data, self.digest)}
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) < len(data):
+            self.variants["gzip"] = (compressed, f"{self.digest}-gz")
+        if brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+            if len(compressed) < len(data):
+                self.variants["br"] = (compressed, f"{self.digest}-br")
+
+    def negotiate(self, accept_encoding):
+        """Return (encoding, body, etag) for the best encoding the client accepts."""
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accept_encoding[encoding]:
+                return (encoding,) + self.variants[encoding]
+        return ("identity",) + self.variants["identity"]
+
+
+class StaticAssets:
+    """Frontend files read, fingerprinted and precompressed once at startup.
+
+    Each file is reachable under its plain name (revalidated on every use)
+    and under a content-hashed name such as script.1a2b3c4d5e6f.js that is
+    cached for a year. index.html is rewritten to reference the hashed
+    names, so a deploy that changes a file changes the URL browsers fetch.
+    """
+
+    def __init__(self, root, filenames=FRONTEND_FILES):
+        contents = {}
+        for name in filenames:
+            path = os.path.join(root, name)
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    contents[name] = f.read()
+        assets = {name: Asset(name, data) for name, data in contents.items() if name != "index.html"}
+        if "index.html" in contents:
+            html = contents["index.html"]
+            for asset in assets.values():
+                for attr in (b"src", b"href"):
+                    html = html.replace(b'%s="%s"' % (attr, asset.name.encode()),
+                                        b'%s="%s"' % (attr, asset.fingerprinted.encode()))
+            assets["index.html"] = Asset("index.html", html)
+        self.by_path = {}
+        for asset in assets.values():
+            self.by_path[asset.name] = (asset, REVALIDATE)
+            if asset.name != "index.html":
+                self.by_path[asset.fingerprinted] = (asset, IMMUTABLE)
+
+    def get(self, path):
+        """Return (asset, cache_control) for a request path, or None."""
+        return self.by_path.get(path)
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS found_items (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    item_norm TEXT NOT NULL,
+    area TEXT NOT NULL,
+    spot TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    reported_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS found_items_item ON found_items (item_norm, reported_at);
+CREATE INDEX IF NOT EXISTS found_items_area ON found_items (area, reported_at);
+CREATE INDEX IF NOT EXISTS found_items_item_area ON found_items (item_norm, area, reported_at);
+CREATE INDEX IF NOT EXISTS found_items_time ON found_items (reported_at);
+"""
+
+COLUMNS = ("id", "item", "item_norm", "area", "spot", "description", "reported_at")
+
+
+class FoundStore:
+    """Found items reported by the desks, kept in a SQLite database.
+
+    The database runs in WAL mode, so searches never wait on a writer and
+    writers only wait on each other for the length of one insert. Every
+    search filter (normalized item, area, reported since) is covered by an
+    index ending in reported_at, so the newest-first results are read
+    straight off the index instead of scanning and sorting the table.
+
+    Connections are opened per thread, and per process, since a sqlite3
+    connection must not cross a fork or be shared between threads.
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def add(self, item, item_norm, area, spot="", description="", reported_at=None):
+        """Record a found item and return it as a dict."""
+        record = {
+            "item": item,
+            "item_norm": item_norm,
+            "area": area,
+            "spot": spot,
+            "description": description,
+            "reported_at": time.time() if reported_at is None else reported_at,
+        }
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO found_items (item, item_norm, area, spot, description, reported_at)"
+                " VALUES (:item, :item_norm, :area, :spot, :description, :reported_at)",
+                record)
+        record["id"] = cursor.lastrowid
+        return record
+
+    def search(self, item_norm=None, area=None, since=None, limit=50):
+        """Return matching found items as dicts, newest first."""
+        clauses = []
+        params = []
+        for column, value in (("item_norm", item_norm), ("area", area)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("reported_at >= ?")
+            params.append(since)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM found_items{where}"
+            " ORDER BY reported_at DESC LIMIT ?",
+            params + [limit])
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def after(self, last_id, limit=1000):
+        """Return found items added after the one with id last_id, oldest first."""
+        rows = self._conn().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM found_items WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, limit))
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def last_id(self):
+        """Return the id of the newest found item, or 0 for an empty store."""
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM found_items").fetchone()[0]
+
+    def _conn(self):
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+        return local.conn
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
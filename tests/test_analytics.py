@@ -0,0 +1,19 @@
+from analytics import SpaceSaving
+
+
+def test_space_saving_replaces_the_smallest_counter():
+    summary = SpaceSaving(k=2)
+    for key in ["a", "a", "a", "b", "c"]:
+        summary.add(key)
+    assert summary.top() == [("a", 3, 0), ("c", 2, 1)]
+
+
+def test_space_saving_keeps_heavy_hitters_among_many_new_keys():
+    summary = SpaceSaving(k=10)
+    for i in range(10000):
+        summary.add("wallet" if i % 4 == 0 else f"rare-{i}")
+    key, count, error = summary.top(1)[0]
+    assert key == "wallet"
+    assert count - error <= 2500 <= count
+    assert len(summary.counters) == 10
+    assert len(summary._heap) <= 4 * summary.k
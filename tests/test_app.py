@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp()
+os.environ.update({
+    'WARMUP': '0',
+    'RATE_LIMIT_RPS': '0',
+    'FOUND_DB_PATH': os.path.join(_tmp, 'found_items.db'),
+    'FOUND_ITEMS_TOKEN': 'desk-token',
+    'ANALYTICS_DIR': os.path.join(_tmp, 'analytics'),
+    'PROFILE_DIR': os.path.join(_tmp, 'profiles'),
+})
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def test_found_item_reports_need_the_token(client, monkeypatch):
+    report = {'item': 'black umbrella', 'area': 'Central Campus'}
+    assert client.post('/found-items', json=report).status_code == 403
+    assert client.post('/found-items', json=report, headers={'X-Report-Token': 'wrong'}).status_code == 403
+    assert client.post('/found-items', json=report, headers={'X-Report-Token': 'desk-token'}).status_code == 201
+    monkeypatch.setattr(app, 'FOUND_ITEMS_TOKEN', None)
+    assert client.post('/found-items', json=report, headers={'X-Report-Token': ''}).status_code == 403
+
+
+def test_profile_write_failure_does_not_fail_the_request(client, monkeypatch):
+    monkeypatch.setattr(app.profiler, 'directory', '/proc/nope')
+    monkeypatch.setattr(app.profiler, 'sample_rate', 1.0)
+    response = client.get('/lost-found?item=keys&area=Central%20Campus')
+    assert response.status_code == 200
+    assert 'X-Profile-Id' not in response.headers
+
+
+def names(response):
+    return [spot['name'] for spot in response.get_json()]
+
+
+def test_location_tag_does_not_hide_the_item(client):
+    response = client.get('/lost-found', query_string={'item': 'lost my walet near the dorm', 'area': 'x'})
+    assert names(response) == ['UAPD Lost & Found', 'Likins Hall Desk']
+
+
+def test_modifier_is_not_matched_on_its_own(client):
+    response = client.get('/lost-found', query_string={'item': 'lost my car keys', 'area': 'x'})
+    assert names(response) == ['Student Union Info Desk', 'Likins Hall Desk']
+
+
+def batch(client, queries):
+    return client.post('/lost-found/batch', data=json.dumps({'queries': queries}), content_type='text/plain')
+
+
+def test_batch_answers_in_request_order_with_per_entry_errors(client):
+    response = batch(client, [
+        {'item': 'lost my wallet', 'area': 'Central Campus'},
+        {'item': 'keys'},
+        {'item': 'k' * (app.MAX_ITEM_LENGTH + 1), 'area': 'Central Campus'},
+        {'item': 'keys', 'area': 'South Campus'},
+    ])
+    assert response.status_code == 200
+    wallet, missing, too_long, keys = response.get_json()['results']
+    assert [spot['name'] for spot in wallet] == ['UAPD Lost & Found']
+    assert missing == {'error': 'Missing "item" or "area".'}
+    assert too_long == {'error': f'"item" must be at most {app.MAX_ITEM_LENGTH} characters.'}
+    assert [spot['name'] for spot in keys] == ['Likins Hall Desk', 'Student Union Info Desk']
+
+
+def test_batch_rejects_bad_and_oversized_bodies(client):
+    assert client.post('/lost-found/batch', data='not json').status_code == 400
+    assert batch(client, []).status_code == 400
+    too_many = [{'item': 'keys', 'area': 'Central Campus'}] * (app.BATCH_MAX_ITEMS + 1)
+    assert batch(client, too_many).status_code == 413
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from cache import ResultCache, SingleFlight
+
+
+def test_version_change_clears_the_cache():
+    cache = ResultCache()
+    cache.get("a", 1)
+    cache.put("a", b"old", 1)
+    assert cache.get("a", 1) == b"old"
+    assert cache.get("a", 2) is None
+    assert cache.stats()["size"] == 0
+    assert cache.invalidations == 1
+
+
+def test_expired_entry_counts_as_an_eviction():
+    cache = ResultCache(ttl=0)
+    cache.get("a", 1)
+    cache.put("a", b"body", 1)
+    assert cache.get("a", 1) is None
+    assert (cache.evictions, cache.misses, cache.stats()["size"]) == (1, 2, 0)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache(maxsize=2)
+    cache.get("a", 1)
+    cache.put("a", b"a", 1)
+    cache.put("b", b"b", 1)
+    cache.get("a", 1)
+    cache.put("c", b"c", 1)
+    assert cache.get("b", 1) is None
+    assert (cache.get("a", 1), cache.get("c", 1)) == (b"a", b"c")
+    assert cache.evictions == 1
+
+
+def test_put_with_a_stale_version_is_ignored():
+    cache = ResultCache()
+    cache.get("a", 2)
+    cache.put("a", b"stale", 1)
+    assert cache.get("a", 2) is None
+    assert cache.stats()["size"] == 0
+
+
+def run_together(flight, fn, callers=8):
+    """Call flight.do("key", fn) from several threads; return their outcomes."""
+    outcomes = []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            result = flight.do("key", fn)
+        except Exception as e:
+            result = e
+        with lock:
+            outcomes.append(result)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return b"body"
+
+    assert run_together(flight, compute) == [b"body"] * 8
+    assert len(calls) == 1
+    assert flight.coalesced == 7
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight()
+    error = ValueError("catalog unavailable")
+
+    def compute():
+        time.sleep(0.2)
+        raise error
+
+    assert run_together(flight, compute) == [error] * 8
+    with pytest.raises(ValueError):
+        flight.do("key", compute)
@@ -0,0 +1,40 @@
+import json
+import os
+import time
+
+from catalog import Catalog, _all_pairs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load():
+    with open(os.path.join(ROOT, "spots.json")) as f:
+        data = json.load(f)
+    return Catalog(data["spots"], data.get("synonyms"), distances=data.get("distances"))
+
+
+def test_long_single_token_item_is_fast():
+    catalog = load()
+    item = "k" * 4000 + "keys"
+    start = time.perf_counter()
+    ids = catalog.lookup(item)
+    assert time.perf_counter() - start < 0.5
+    assert [catalog.names[i] for i in ids] == ["Student Union Info Desk", "Likins Hall Desk"]
+
+
+def test_synonyms_match_whole_words_only():
+    catalog = load()
+    for item, synonym in [("ring", "keyring"), ("car", "scarf"), ("art", "smartphone"),
+                          ("book", "macbook"), ("id", "android")]:
+        assert synonym not in catalog.matching_terms(item)
+    assert "keyring" in catalog.matching_terms("gold keyring")
+    assert "student id" in catalog.matching_terms("my student id card")
+
+
+def test_all_pairs_shortest_distances():
+    # 0 -5- 1 -1- 2, plus a slower direct 0-2 edge; 3 is unreachable
+    dist = _all_pairs(4, [(0, 1, 5), (1, 2, 1), (0, 2, 9), (1, 0, 7)])
+    rows = [list(dist[i * 4:(i + 1) * 4]) for i in range(4)]
+    inf = float("inf")
+    assert rows == [[0, 5, 6, inf], [5, 0, 1, inf], [6, 1, 0, inf], [inf, inf, inf, 0]]
+
@@ -0,0 +1,16 @@
+from limiter import RateLimiter
+
+
+def test_cost_above_burst_is_limited():
+    limiter = RateLimiter(rate=10.0, burst=20.0)
+    assert limiter.check("client", cost=50) == 0.0
+    # The first oversized batch emptied the bucket, so the next one waits
+    assert limiter.check("client", cost=50) > 1.9
+    assert limiter.check("client", cost=1) > 0.0
+
+
+def test_cost_within_burst_spends_tokens():
+    limiter = RateLimiter(rate=10.0, burst=20.0)
+    assert limiter.check("client", cost=15) == 0.0
+    assert limiter.check("client", cost=10) > 0.0
+    assert limiter.check("client", cost=5) == 0.0
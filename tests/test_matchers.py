@@ -0,0 +1,16 @@
+import pytest
+
+from matchers import ENGINES, Matcher, get_matcher
+
+
+def test_engine_without_terms_cannot_be_created():
+    class Incomplete(Matcher):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_every_engine_can_be_created():
+    for name in ENGINES:
+        assert get_matcher(name).name == name
@@ -0,0 +1,56 @@
+import json
+import os
+import time
+
+from metrics import CallbackGauge, Counter, Histogram, Registry
+
+
+def registry(directory):
+    metrics = Registry(str(directory), interval=5.0)
+    requests = metrics.register(Counter('requests_total', 'Requests.', ('status',)))
+    latency = metrics.register(Histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0)))
+    metrics.register(CallbackGauge('connections', 'Open connections.', lambda: 2))
+    return metrics, requests, latency
+
+
+def write_worker(directory, pid, age=0.0, requests=3):
+    snapshot = {
+        "pid": pid,
+        "time": time.time() - age,
+        "metrics": {
+            "requests_total": [[["200"], requests]],
+            "latency_seconds": [[[], [[1, 0, 1], 2.05]]],
+            "connections": [[[], 5]],
+        },
+    }
+    with open(os.path.join(directory, f"metrics-{pid}.json"), "w") as f:
+        json.dump(snapshot, f)
+
+
+def test_scrape_sums_every_worker(tmp_path):
+    metrics, requests, latency = registry(tmp_path)
+    requests.inc("200", amount=2)
+    latency.observe(0.5)
+    write_worker(tmp_path, 1)
+    text = metrics.render()
+    assert 'requests_total{status="200"} 5' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_count 3' in text
+    assert 'connections 7' in text
+
+
+def test_exited_workers_keep_counters_but_not_gauges(tmp_path):
+    metrics, requests, _ = registry(tmp_path)
+    write_worker(tmp_path, 1, age=3600)
+    text = metrics.render()
+    assert 'requests_total{status="200"} 3' in text
+    assert 'connections 2' in text
+
+
+def test_flush_writes_this_process(tmp_path):
+    metrics, requests, _ = registry(tmp_path)
+    metrics.start()
+    requests.inc("500")
+    with open(metrics.flush()) as f:
+        assert json.load(f)["metrics"]["requests_total"] == [[["500"], 1]]
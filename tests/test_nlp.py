@@ -0,0 +1,21 @@
+import pytest
+
+from nlp import check_parity, item_phrase, regex_tokenize
+
+
+def test_item_phrase_ends_with_the_item():
+    for text, words in [("black umbrella", ["black", "umbrella"]),
+                        ("lost my red water bottle near the rec", ["red", "water", "bottle"]),
+                        ("i lost my mom's ring", ["mom", "ring"]),
+                        ("lost: black umbrella", ["black", "umbrella"]),
+                        ("near the library", ["library"])]:
+        assert item_phrase(regex_tokenize(text)) == words
+
+
+def test_regex_tokenizer_matches_nltk():
+    nltk = pytest.importorskip("nltk")
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        pytest.skip("punkt is not installed")
+    assert check_parity() == []
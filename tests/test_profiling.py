@@ -0,0 +1,26 @@
+import os
+
+from profiling import RequestProfiler
+
+
+def test_settings_reach_other_processes(tmp_path):
+    worker, other = RequestProfiler(str(tmp_path)), RequestProfiler(str(tmp_path))
+    worker.configure(enabled=False, sample_rate=0.25)
+    assert other.refresh()
+    assert (other.enabled, other.sample_rate) == (False, 0.25)
+    assert not other.refresh()
+
+
+def test_settings_from_a_previous_run_are_ignored(tmp_path):
+    RequestProfiler(str(tmp_path)).configure(sample_rate=0.5)
+    os.utime(tmp_path / "profiling.json", (0, 0))
+    profiler = RequestProfiler(str(tmp_path))
+    assert not profiler.refresh()
+    assert profiler.sample_rate == 0.0
+
+
+def test_failed_write_still_returns_the_result(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    profiler = RequestProfiler(str(blocker / "profiles"))
+    assert profiler.run("view", lambda: 42) == (42, None)